@@ -0,0 +1,83 @@
+from typing import Any, Awaitable, Callable
+from app.core.config import settings
+import logging
+import time
+import orjson
+
+# Redis is optional - without it the cache stays process-local
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+# Bump when the shape of cached payloads changes so stale entries
+# written by old workers are never served to new ones
+CACHE_SCHEMA_VERSION = "v1"
+
+_redis = None
+_redis_failed = False
+
+# Process-local fallback: key -> (value, expiry timestamp)
+_local: dict = {}
+
+
+def _get_redis():
+    """Return the shared Redis client, or None when Redis is unavailable"""
+    global _redis, _redis_failed
+    if aioredis is None or _redis_failed:
+        return None
+    if _redis is None:
+        try:
+            _redis = aioredis.from_url(settings.redis_url)
+        except Exception as e:
+            logger.warning(f"Redis unavailable, using process-local cache: {e}")
+            _redis_failed = True
+    return _redis
+
+
+async def cached(key: str, ttl: int, loader: Callable[[], Awaitable[Any]]) -> Any:
+    """Read-through cache shared across workers via Redis.
+
+    The first worker to miss runs the loader and warms the entry; every
+    other worker reads the cached value without touching the upstream
+    service. Falls back to a process-local dict when Redis is down.
+    """
+    full_key = f"{CACHE_SCHEMA_VERSION}:{key}"
+    client = _get_redis()
+    if client is not None:
+        try:
+            raw = await client.get(full_key)
+            if raw is not None:
+                return orjson.loads(raw)
+        except Exception as e:
+            logger.warning(f"Redis read failed for {full_key}: {e}")
+            client = None
+    if client is None:
+        entry = _local.get(full_key)
+        if entry and entry[1] > time.time():
+            return entry[0]
+
+    value = await loader()
+
+    if client is not None:
+        try:
+            await client.set(full_key, orjson.dumps(value), ex=ttl)
+            return value
+        except Exception as e:
+            logger.warning(f"Redis write failed for {full_key}: {e}")
+    _local[full_key] = (value, time.time() + ttl)
+    return value
+
+
+async def invalidate(key: str):
+    """Evict a cache entry from Redis and the local fallback"""
+    full_key = f"{CACHE_SCHEMA_VERSION}:{key}"
+    _local.pop(full_key, None)
+    client = _get_redis()
+    if client is not None:
+        try:
+            await client.delete(full_key)
+        except Exception as e:
+            logger.warning(f"Redis invalidation failed for {full_key}: {e}")
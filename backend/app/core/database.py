@@ -1,61 +1,85 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import text, JSON
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.pool import StaticPool
 from app.core.config import settings
 import logging
+import time
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create database engine
+# Create async database engine (SQL logging is configured via the
+# "sqlalchemy.engine" logger in init_db, not the echo flag)
 try:
-    engine = create_engine(
+    engine = create_async_engine(
         settings.database_url,
-        poolclass=StaticPool,
-        echo=settings.debug,
-        pool_pre_ping=True
+        pool_pre_ping=True,
+        pool_size=settings.pool_size,
+        max_overflow=settings.max_overflow,
+        pool_timeout=settings.pool_timeout,
+        pool_recycle=settings.pool_recycle
     )
     logger.info("Database engine created successfully")
 except Exception as e:
     logger.error(f"Failed to create database engine: {e}")
-    # Fallback to SQLite for development
-    engine = create_engine(
-        "sqlite:///./precision_marketing.db",
-        connect_args={"check_same_thread": False},
-        echo=settings.debug
+    # Fallback to SQLite for development (single shared connection)
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///./precision_marketing.db",
+        poolclass=StaticPool
     )
     logger.info("Using SQLite fallback database")
 
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
 
 # Create base class for models
-Base = declarative_base()
+class Base(DeclarativeBase):
+    pass
 
-def get_db() -> Session:
+# JSON columns are JSONB on Postgres (binary storage, GIN-indexable)
+# but must degrade to plain JSON on the SQLite fallback engine, which
+# has no JSONB type
+JSONVariant = JSON().with_variant(JSONB, "postgresql")
+
+async def get_db() -> AsyncSession:
     """Dependency to get database session"""
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
-def init_db():
+async def init_db():
     """Initialize database with tables"""
+    # SQL statement logging only when explicitly debugging; disabled log
+    # sites then cost nothing instead of formatting every statement
+    logging.getLogger("sqlalchemy.engine").setLevel(
+        logging.INFO if settings.debug else logging.WARNING
+    )
     try:
-        Base.metadata.create_all(bind=engine)
+        # Force-register every model (app.models imports lazily otherwise)
+        import app.models
+        for name in app.models.__all__:
+            getattr(app.models, name)
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Failed to create database tables: {e}")
 
-def check_db_connection():
-    """Check if database connection is working"""
+# Cached health-check result: (ok, 5-second time bucket)
+_db_health = (False, -1)
+
+async def check_db_connection():
+    """Check if database connection is working (result cached for 5 seconds)"""
+    global _db_health
+    bucket = int(time.time() // 5)
+    if _db_health[1] == bucket:
+        return _db_health[0]
     try:
-        with engine.connect() as connection:
-            connection.execute("SELECT 1")
-        return True
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+        ok = True
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
-        return False
+        ok = False
+    _db_health = (ok, bucket)
+    return ok
@@ -1,13 +1,21 @@
-from .user import User
-from .campaign import Campaign
-from .analytics import Analytics
-from .ml_prediction import MLPrediction
-from .powerbi_report import PowerBIReport
+import importlib
 
-__all__ = [
-    "User",
-    "Campaign", 
-    "Analytics",
-    "MLPrediction",
-    "PowerBIReport"
-]
+# Lazy model imports (PEP 562) so workers only pay for the models they use.
+# init_db() in app.core.database force-imports everything before create_all().
+_LAZY = {
+    "User": "user",
+    "Campaign": "campaign",
+    "Analytics": "analytics",
+    "MLPrediction": "ml_prediction",
+    "PowerBIReport": "powerbi_report",
+}
+
+__all__ = list(_LAZY)
+
+def __getattr__(name):
+    if name in _LAZY:
+        module = importlib.import_module(f".{_LAZY[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,103 +1,133 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, ForeignKey, JSON
+from sqlalchemy import String, Boolean, DateTime, Float, Numeric, ForeignKey, Index, Computed, insert
+from sqlalchemy.dialects.postgresql import REAL
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
-from app.core.database import Base
+from sqlalchemy.orm import relationship, Mapped, mapped_column
+from sqlalchemy.ext.hybrid import hybrid_property
+from app.core.database import Base, JSONVariant
 from datetime import datetime
+from typing import Optional, Dict, List, Any
+import numpy as np
 
 class Analytics(Base):
     __tablename__ = "analytics"
-    
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    campaign_id = Column(Integer, ForeignKey("campaigns.id"), nullable=True)
-    
+    __table_args__ = (
+        Index("ix_analytics_user_date", "user_id", "metric_date"),
+        Index("ix_analytics_campaign_date", "campaign_id", "metric_date"),
+        Index("ix_analytics_source_period", "data_source", "metric_period"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    campaign_id: Mapped[Optional[int]] = mapped_column(ForeignKey("campaigns.id"))
+
     # Analytics metadata
-    data_source = Column(String(100), nullable=False)  # google_analytics, facebook, linkedin, etc.
-    metric_date = Column(DateTime(timezone=True), nullable=False)
-    metric_period = Column(String(20), nullable=False)  # daily, weekly, monthly
-    
+    data_source: Mapped[str] = mapped_column(String(100))  # google_analytics, facebook, linkedin, etc.
+    metric_date: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    metric_period: Mapped[str] = mapped_column(String(20))  # daily, weekly, monthly
+
     # Core metrics
-    impressions = Column(Integer, default=0)
-    clicks = Column(Integer, default=0)
-    conversions = Column(Integer, default=0)
-    spend = Column(Float, default=0.0)
-    revenue = Column(Float, default=0.0)
-    
+    impressions: Mapped[int] = mapped_column(default=0)
+    clicks: Mapped[int] = mapped_column(default=0)
+    conversions: Mapped[int] = mapped_column(default=0)
+    spend: Mapped[float] = mapped_column(Numeric(14, 4, asdecimal=False), default=0.0)
+    revenue: Mapped[float] = mapped_column(Numeric(14, 4, asdecimal=False), default=0.0)
+
     # Calculated metrics
-    ctr = Column(Float, default=0.0)  # Click-through rate
-    cpc = Column(Float, default=0.0)  # Cost per click
-    cpa = Column(Float, default=0.0)  # Cost per acquisition
-    roas = Column(Float, default=0.0)  # Return on ad spend
-    conversion_rate = Column(Float, default=0.0)
-    
+    ctr: Mapped[float] = mapped_column(REAL, default=0.0)  # Click-through rate
+    cpc: Mapped[float] = mapped_column(Numeric(14, 4, asdecimal=False), default=0.0)  # Cost per click
+    cpa: Mapped[float] = mapped_column(Numeric(14, 4, asdecimal=False), default=0.0)  # Cost per acquisition
+    roas: Mapped[float] = mapped_column(default=0.0)  # Return on ad spend
+    conversion_rate: Mapped[float] = mapped_column(REAL, default=0.0)
+
+    # Stored generated column - Postgres evaluates once on write so
+    # dashboards can ORDER BY efficiency_score with index support
+    # CASE-based capping instead of LEAST so the expression also
+    # compiles on the SQLite fallback engine
+    efficiency_score: Mapped[Optional[float]] = mapped_column(Float, Computed(
+        "CASE WHEN impressions = 0 THEN 0 ELSE "
+        "0.3*(CASE WHEN ctr*1000 > 100 THEN 100 ELSE ctr*1000 END) + "
+        "0.4*(CASE WHEN conversion_rate*1000 > 100 THEN 100 ELSE conversion_rate*1000 END) + "
+        "0.3*(CASE WHEN roas*10 > 100 THEN 100 ELSE roas*10 END) END",
+        persisted=True), index=True)
+
     # Channel-specific metrics
-    channel = Column(String(100), nullable=True)
-    ad_group = Column(String(255), nullable=True)
-    keyword = Column(String(255), nullable=True)
-    placement = Column(String(255), nullable=True)
-    
+    channel: Mapped[Optional[str]] = mapped_column(String(100))
+    ad_group: Mapped[Optional[str]] = mapped_column(String(255))
+    keyword: Mapped[Optional[str]] = mapped_column(String(255))
+    placement: Mapped[Optional[str]] = mapped_column(String(255))
+
     # Audience metrics
-    reach = Column(Integer, default=0)
-    frequency = Column(Float, default=0.0)
-    unique_visitors = Column(Integer, default=0)
-    returning_visitors = Column(Integer, default=0)
-    
+    reach: Mapped[int] = mapped_column(default=0)
+    frequency: Mapped[float] = mapped_column(REAL, default=0.0)
+    unique_visitors: Mapped[int] = mapped_column(default=0)
+    returning_visitors: Mapped[int] = mapped_column(default=0)
+
     # Engagement metrics
-    time_on_site = Column(Float, default=0.0)
-    bounce_rate = Column(Float, default=0.0)
-    page_views = Column(Integer, default=0)
-    social_shares = Column(Integer, default=0)
-    
+    time_on_site: Mapped[float] = mapped_column(default=0.0)
+    bounce_rate: Mapped[float] = mapped_column(REAL, default=0.0)
+    page_views: Mapped[int] = mapped_column(default=0)
+    social_shares: Mapped[int] = mapped_column(default=0)
+
     # Custom dimensions
-    custom_dimensions = Column(JSON, nullable=True)  # JSON object with custom metrics
-    segments = Column(JSON, nullable=True)  # JSON array of audience segments
-    
+    custom_dimensions: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONVariant)  # JSON object with custom metrics
+    segments: Mapped[Optional[List[Any]]] = mapped_column(JSONVariant)  # JSON array of audience segments
+
     # Data quality
-    data_confidence = Column(Float, default=1.0)  # 0.0 to 1.0
-    is_estimated = Column(Boolean, default=False)
-    last_updated = Column(DateTime(timezone=True), server_default=func.now())
-    
+    data_confidence: Mapped[float] = mapped_column(REAL, default=1.0)  # 0.0 to 1.0
+    is_estimated: Mapped[bool] = mapped_column(Boolean, default=False)
+    last_updated: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-    
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), onupdate=func.now())
+
     # Relationships
-    user = relationship("User", back_populates="analytics")
-    campaign = relationship("Campaign", back_populates="analytics")
-    
+    user = relationship("User", back_populates="analytics", lazy="selectin")
+    campaign = relationship("Campaign", back_populates="analytics", lazy="selectin")
+
     def __repr__(self):
         return f"<Analytics(id={self.id}, date='{self.metric_date}', source='{self.data_source}')>"
-    
-    @property
+
+    @hybrid_property
     def is_performing_well(self):
-        """Check if metrics indicate good performance"""
-        if self.ctr >= 0.02 and self.conversion_rate >= 0.01 and self.roas >= 2.0:
-            return True
-        return False
-    
-    @property
+        """Check if metrics indicate good performance (usable in SQL filters)"""
+        return (self.ctr >= 0.02) & (self.conversion_rate >= 0.01) & (self.roas >= 2.0)
+
+    @hybrid_property
     def needs_attention(self):
-        """Check if metrics indicate issues that need attention"""
-        if self.ctr < 0.005 or self.conversion_rate < 0.005 or self.roas < 1.0:
-            return True
-        return False
-    
+        """Check if metrics indicate issues that need attention (usable in SQL filters)"""
+        return (self.ctr < 0.005) | (self.conversion_rate < 0.005) | (self.roas < 1.0)
+
     @property
     def trend_direction(self):
         """Determine trend direction based on metrics"""
         # This would typically compare with previous period data
         # For now, return neutral
         return "neutral"
-    
-    @property
-    def efficiency_score(self):
-        """Calculate overall efficiency score"""
-        if self.impressions == 0:
-            return 0
-        
-        # Weighted score based on multiple metrics
-        ctr_score = min(self.ctr * 1000, 100)
-        conversion_score = min(self.conversion_rate * 1000, 100)
-        roas_score = min(self.roas * 10, 100)
-        
-        return (ctr_score * 0.3 + conversion_score * 0.4 + roas_score * 0.3)
+
+    @classmethod
+    def bulk_efficiency_score(cls, rows):
+        """Compute efficiency scores for many rows at once as a NumPy array"""
+        n = len(rows)
+        ctr = np.fromiter((r.ctr or 0.0 for r in rows), dtype=np.float64, count=n)
+        conversion_rate = np.fromiter((r.conversion_rate or 0.0 for r in rows), dtype=np.float64, count=n)
+        roas = np.fromiter((r.roas or 0.0 for r in rows), dtype=np.float64, count=n)
+        impressions = np.fromiter((r.impressions or 0 for r in rows), dtype=np.float64, count=n)
+
+        scores = (
+            np.minimum(ctr * 1000, 100) * 0.3 +
+            np.minimum(conversion_rate * 1000, 100) * 0.4 +
+            np.minimum(roas * 10, 100) * 0.3
+        )
+        return np.where(impressions == 0, 0.0, scores)
+
+    @classmethod
+    async def bulk_ingest(cls, session, dicts: List[Dict[str, Any]], batch_size: int = 1000):
+        """Insert many analytics rows with Core-level multi-values INSERTs
+
+        Skips per-row ORM bookkeeping (identity map, autoflush) so metric
+        ingestion amortizes one round-trip per batch instead of per row.
+        """
+        stmt = insert(cls)
+        for i in range(0, len(dicts), batch_size):
+            await session.execute(stmt, dicts[i:i + batch_size])
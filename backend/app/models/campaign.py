@@ -1,13 +1,19 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, Numeric, ForeignKey, Index, Computed, and_
+from sqlalchemy.dialects.postgresql import REAL
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from app.core.database import Base
-from datetime import datetime
+from sqlalchemy.ext.hybrid import hybrid_property
+from app.core.database import Base, JSONVariant
+from datetime import datetime, timezone
+import numpy as np
 
 class Campaign(Base):
     __tablename__ = "campaigns"
-    
-    id = Column(Integer, primary_key=True, index=True)
+    __table_args__ = (
+        Index("ix_campaign_user_status", "user_id", "status"),
+    )
+
+    id = Column(Integer, primary_key=True)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -19,54 +25,80 @@ class Campaign(Base):
     end_date = Column(DateTime(timezone=True), nullable=True)
     
     # Budget and goals
-    budget = Column(Float, nullable=True)
+    budget = Column(Numeric(14, 4, asdecimal=False), nullable=True)
     target_audience = Column(Text, nullable=True)
-    goals = Column(JSON, nullable=True)  # JSON object with KPIs
+    goals = Column(JSONVariant, nullable=True)  # JSON object with KPIs
     
     # Performance metrics
     impressions = Column(Integer, default=0)
     clicks = Column(Integer, default=0)
     conversions = Column(Integer, default=0)
-    spend = Column(Float, default=0.0)
+    spend = Column(Numeric(14, 4, asdecimal=False), default=0.0)
     
     # Calculated metrics
-    ctr = Column(Float, default=0.0)  # Click-through rate
-    cpc = Column(Float, default=0.0)  # Cost per click
-    cpa = Column(Float, default=0.0)  # Cost per acquisition
+    ctr = Column(REAL, default=0.0)  # Click-through rate
+    cpc = Column(Numeric(14, 4, asdecimal=False), default=0.0)  # Cost per click
+    cpa = Column(Numeric(14, 4, asdecimal=False), default=0.0)  # Cost per acquisition
     roas = Column(Float, default=0.0)  # Return on ad spend
-    
+
+    # Stored generated column - Postgres evaluates once on write so
+    # dashboards can ORDER BY performance_score with index support
+    # CASE-based capping and ANSI CAST instead of LEAST/::float so the
+    # expression also compiles on the SQLite fallback engine
+    performance_score = Column(Float, Computed(
+        "CASE WHEN impressions = 0 THEN 0 ELSE "
+        "0.3*(CASE WHEN ctr*100 > 100 THEN 100 ELSE ctr*100 END) + "
+        "0.4*(CASE WHEN (CAST(conversions AS FLOAT)/NULLIF(impressions, 0))*1000 > 100 "
+        "THEN 100 ELSE (CAST(conversions AS FLOAT)/NULLIF(impressions, 0))*1000 END) + "
+        "0.3*(CASE WHEN roas*20 > 100 THEN 100 ELSE roas*20 END) END",
+        persisted=True), index=True)
+
     # Campaign settings
-    channels = Column(JSON, nullable=True)  # Array of channel names
-    targeting_criteria = Column(JSON, nullable=True)
-    creative_assets = Column(JSON, nullable=True)
+    channels = Column(JSONVariant, nullable=True)  # Array of channel names
+    targeting_criteria = Column(JSONVariant, nullable=True)
+    creative_assets = Column(JSONVariant, nullable=True)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
-    user = relationship("User", back_populates="campaigns")
-    analytics = relationship("Analytics", back_populates="campaign")
+    user = relationship("User", back_populates="campaigns", lazy="selectin")
+    # Unbounded collection - load explicitly with selectinload(Campaign.analytics)
+    analytics = relationship("Analytics", back_populates="campaign", lazy="raise")
+    ml_predictions = relationship("MLPrediction", back_populates="campaign", lazy="raise")
     
     def __repr__(self):
         return f"<Campaign(id={self.id}, name='{self.name}', status='{self.status}')>"
     
-    @property
+    @hybrid_property
     def is_active(self):
         if not self.start_date or not self.end_date:
             return False
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc)
         return self.start_date <= now <= self.end_date and self.status == "active"
+
+    @is_active.expression
+    def is_active(cls):
+        return and_(
+            cls.start_date <= func.now(),
+            cls.end_date >= func.now(),
+            cls.status == "active"
+        )
     
-    @property
-    def performance_score(self):
-        """Calculate overall performance score based on metrics"""
-        if self.impressions == 0:
-            return 0
-        
-        # Weighted score based on CTR, conversions, and ROAS
-        ctr_score = min(self.ctr * 100, 100)  # Normalize CTR
-        conversion_score = min((self.conversions / self.impressions) * 1000, 100)
-        roas_score = min(self.roas * 20, 100)  # Normalize ROAS
-        
-        return (ctr_score * 0.3 + conversion_score * 0.4 + roas_score * 0.3)
+    @classmethod
+    def bulk_performance_score(cls, rows):
+        """Compute performance scores for many rows at once as a NumPy array"""
+        n = len(rows)
+        ctr = np.fromiter((r.ctr or 0.0 for r in rows), dtype=np.float64, count=n)
+        conversions = np.fromiter((r.conversions or 0 for r in rows), dtype=np.float64, count=n)
+        roas = np.fromiter((r.roas or 0.0 for r in rows), dtype=np.float64, count=n)
+        impressions = np.fromiter((r.impressions or 0 for r in rows), dtype=np.float64, count=n)
+
+        safe_impressions = np.where(impressions == 0, 1.0, impressions)
+        scores = (
+            np.minimum(ctr * 100, 100) * 0.3 +
+            np.minimum((conversions / safe_impressions) * 1000, 100) * 0.4 +
+            np.minimum(roas * 20, 100) * 0.3
+        )
+        return np.where(impressions == 0, 0.0, scores)
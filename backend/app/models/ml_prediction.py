@@ -1,12 +1,24 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, Numeric, ForeignKey, Index, or_
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from app.core.database import Base
+from sqlalchemy.ext.hybrid import hybrid_property
+from app.core.database import Base, JSONVariant
 from datetime import datetime
 
+# Insight strings interned once, keyed by (prediction_type, probability bucket)
+_INSIGHTS = {
+    ("conversion", "high"): "High conversion probability - consider increasing bid or budget",
+    ("conversion", "low"): "Low conversion probability - review targeting or creative",
+    ("churn", "high"): "High churn risk - implement retention strategies",
+}
+_DEFAULT_INSIGHT = "Monitor performance and adjust strategy as needed"
+
 class MLPrediction(Base):
     __tablename__ = "ml_predictions"
-    
+    __table_args__ = (
+        Index("ix_mlpred_user_type_date", "user_id", "prediction_type", "prediction_date"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     campaign_id = Column(Integer, ForeignKey("campaigns.id"), nullable=True)
@@ -17,8 +29,8 @@ class MLPrediction(Base):
     prediction_date = Column(DateTime(timezone=True), server_default=func.now())
     
     # Input features
-    input_features = Column(JSON, nullable=True)  # JSON object with feature values
-    feature_importance = Column(JSON, nullable=True)  # JSON object with feature importance scores
+    input_features = Column(JSONVariant, nullable=True)  # JSON object with feature values
+    feature_importance = Column(JSONVariant, nullable=True)  # JSON object with feature importance scores
     
     # Prediction results
     prediction_value = Column(Float, nullable=False)  # Raw prediction score
@@ -32,8 +44,8 @@ class MLPrediction(Base):
     risk_level = Column(String(20), nullable=True)  # low, medium, high
     
     # Business impact
-    expected_value = Column(Float, nullable=True)  # Expected monetary value
-    roi_prediction = Column(Float, nullable=True)  # Predicted ROI
+    expected_value = Column(Numeric(14, 4, asdecimal=False), nullable=True)  # Expected monetary value
+    roi_prediction = Column(Numeric(14, 4, asdecimal=False), nullable=True)  # Predicted ROI
     conversion_probability = Column(Float, nullable=True)  # Likelihood of conversion
     
     # Model metadata
@@ -46,33 +58,36 @@ class MLPrediction(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
-    user = relationship("User", back_populates="ml_predictions")
-    campaign = relationship("Campaign", back_populates="ml_predictions")
+    user = relationship("User", back_populates="ml_predictions", lazy="selectin")
+    campaign = relationship("Campaign", back_populates="ml_predictions", lazy="selectin")
     
     def __repr__(self):
         return f"<MLPrediction(id={self.id}, type='{self.prediction_type}', value={self.prediction_value})>"
     
-    @property
+    @hybrid_property
     def is_high_confidence(self):
         """Check if prediction has high confidence"""
         return self.confidence_score and self.confidence_score >= 0.8
-    
-    @property
+
+    @is_high_confidence.expression
+    def is_high_confidence(cls):
+        return cls.confidence_score >= 0.8
+
+    @hybrid_property
     def is_high_risk(self):
         """Check if prediction indicates high risk"""
         return self.risk_level == "high" or (self.prediction_probability and self.prediction_probability < 0.3)
+
+    @is_high_risk.expression
+    def is_high_risk(cls):
+        return or_(cls.risk_level == "high", cls.prediction_probability < 0.3)
     
     @property
     def actionable_insight(self):
         """Generate actionable insight from prediction"""
-        if self.prediction_type == "conversion":
-            if self.prediction_probability and self.prediction_probability > 0.7:
-                return "High conversion probability - consider increasing bid or budget"
-            elif self.prediction_probability and self.prediction_probability < 0.3:
-                return "Low conversion probability - review targeting or creative"
-        
-        elif self.prediction_type == "churn":
-            if self.prediction_probability and self.prediction_probability > 0.6:
-                return "High churn risk - implement retention strategies"
-        
-        return "Monitor performance and adjust strategy as needed"
+        probability = self.prediction_probability
+        if probability is None:
+            return _DEFAULT_INSIGHT
+        threshold = 0.6 if self.prediction_type == "churn" else 0.7
+        bucket = "high" if probability > threshold else ("low" if probability < 0.3 else "mid")
+        return _INSIGHTS.get((self.prediction_type, bucket), _DEFAULT_INSIGHT)
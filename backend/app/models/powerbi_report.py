@@ -1,12 +1,26 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Index, cast, or_
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from app.core.database import Base
-from datetime import datetime
+from sqlalchemy.ext.hybrid import hybrid_property
+from app.core.database import Base, JSONVariant
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+# Refresh intervals by schedule name
+REFRESH_INTERVALS = {
+    "daily": timedelta(days=1),
+    "weekly": timedelta(days=7),
+    "monthly": timedelta(days=30),
+}
 
 class PowerBIReport(Base):
     __tablename__ = "powerbi_reports"
-    
+    __table_args__ = (
+        Index("ix_pbi_allowed_users", "allowed_users", postgresql_using="gin"),
+        Index("ix_pbi_allowed_roles", "allowed_roles", postgresql_using="gin"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
@@ -28,18 +42,19 @@ class PowerBIReport(Base):
     
     # Access control
     is_public = Column(Boolean, default=False)
-    allowed_users = Column(JSON, nullable=True)  # Array of user IDs
-    allowed_roles = Column(JSON, nullable=True)  # Array of role names
+    allowed_users = Column(JSONVariant, nullable=True)  # Array of user IDs
+    allowed_roles = Column(JSONVariant, nullable=True)  # Array of role names
     
     # Report settings
     refresh_schedule = Column(String(100), nullable=True)  # daily, weekly, monthly
     last_refresh = Column(DateTime(timezone=True), nullable=True)
+    next_refresh_at = Column(DateTime(timezone=True), nullable=True, index=True)
     auto_refresh = Column(Boolean, default=True)
     
     # Customization
     theme = Column(String(50), default="default")
-    layout_settings = Column(JSON, nullable=True)  # Custom layout preferences
-    filter_defaults = Column(JSON, nullable=True)  # Default filter values
+    layout_settings = Column(JSONVariant, nullable=True)  # Custom layout preferences
+    filter_defaults = Column(JSONVariant, nullable=True)  # Default filter values
     
     # Usage tracking
     view_count = Column(Integer, default=0)
@@ -51,12 +66,25 @@ class PowerBIReport(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
-    user = relationship("User", back_populates="powerbi_reports")
+    user = relationship("User", back_populates="powerbi_reports", lazy="selectin")
     
     def __repr__(self):
         return f"<PowerBIReport(id={self.id}, name='{self.report_name}', type='{self.report_type}')>"
     
-    @property
+    @classmethod
+    def accessible_to(cls, user):
+        """SQL predicate matching reports the given user may access
+
+        Use in queries so the database filters rows before they cross the
+        wire: session.query(PowerBIReport).filter(PowerBIReport.accessible_to(user))
+        """
+        return or_(
+            cls.is_public.is_(True),
+            cls.user_id == user.id,
+            cls.allowed_users.op("@>")(cast([user.id], JSONB)),
+            cls.allowed_roles.op("@>")(cast([user.role], JSONB)),
+        )
+
     def is_accessible(self, current_user=None):
         """Check if report is accessible to current user"""
         if self.is_public:
@@ -79,25 +107,24 @@ class PowerBIReport(Base):
         
         return False
     
-    @property
+    def mark_refreshed(self, refreshed_at: Optional[datetime] = None):
+        """Record a refresh and precompute when the next one is due"""
+        self.last_refresh = refreshed_at or datetime.now(timezone.utc)
+        interval = REFRESH_INTERVALS.get(self.refresh_schedule)
+        self.next_refresh_at = self.last_refresh + interval if interval else None
+
+    @hybrid_property
     def needs_refresh(self):
         """Check if report needs refresh based on schedule"""
-        if not self.last_refresh or not self.refresh_schedule:
+        if not self.next_refresh_at:
             return False
-        
-        now = datetime.utcnow()
-        time_diff = now - self.last_refresh
-        
-        if self.refresh_schedule == "daily" and time_diff.days >= 1:
-            return True
-        elif self.refresh_schedule == "weekly" and time_diff.days >= 7:
-            return True
-        elif self.refresh_schedule == "monthly" and time_diff.days >= 30:
-            return True
-        
-        return False
-    
-    @property
+        return datetime.now(timezone.utc) >= self.next_refresh_at
+
+    @needs_refresh.expression
+    def needs_refresh(cls):
+        return cls.next_refresh_at <= func.now()
+
+    @hybrid_property
     def popularity_score(self):
         """Calculate popularity score based on views and favorites"""
         return (self.view_count * 0.7 + self.favorite_count * 0.3) / 100
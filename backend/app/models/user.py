@@ -1,5 +1,6 @@
 from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
 from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
 from app.core.database import Base
 from datetime import datetime
 
@@ -25,7 +26,13 @@ class User(Base):
     timezone = Column(String(50), default="UTC")
     language = Column(String(10), default="en")
     notification_preferences = Column(Text, nullable=True)  # JSON string
-    
+
+    # Relationships (unbounded collections - load explicitly with selectinload)
+    campaigns = relationship("Campaign", back_populates="user", lazy="raise")
+    analytics = relationship("Analytics", back_populates="user", lazy="raise")
+    ml_predictions = relationship("MLPrediction", back_populates="user", lazy="raise")
+    powerbi_reports = relationship("PowerBIReport", back_populates="user", lazy="raise")
+
     def __repr__(self):
         return f"<User(id={self.id}, email='{self.email}', username='{self.username}')>"
     
@@ -1,27 +1,52 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, BackgroundTasks
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, EmailStr
-from datetime import datetime
+from functools import lru_cache
+from datetime import datetime, timezone
 import asyncio
 import logging
+import zlib
+import orjson
+import msgpack
 
-# Import our email service
+from app.core.config import settings
+
+# Redis pub/sub is optional - without it broadcasts stay worker-local
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+    logging.warning("redis package not available - alerts will be worker-local")
+
+# Import our email service accessor; the service itself is only
+# constructed on first send so importing this router stays cheap
 try:
-    from app.services.email_service import email_service
+    from app.services.email_service import get_email_service
 except ImportError:
-    email_service = None
+    get_email_service = None
     logging.warning("Email service not available - notifications will be web-only")
 
+
+def _email_service():
+    """Resolve the shared email service, or None when unavailable"""
+    if get_email_service is None:
+        return None
+    return get_email_service()
+
 router = APIRouter()
 
 class UserPreferences(BaseModel):
     """User notification preferences"""
+    model_config = {"frozen": True}
+
     email: Optional[EmailStr] = None
     email_notifications: bool = True
     push_notifications: bool = True
     sms_notifications: bool = False
 
 class AlertMessage(BaseModel):
+    model_config = {"frozen": True}
+
     type: str
     title: str
     message: str
@@ -30,29 +55,143 @@ class AlertMessage(BaseModel):
     send_email: bool = True
     email_recipients: Optional[List[EmailStr]] = None
 
-active_connections: List[WebSocket] = []
+# Wire formats clients can negotiate via Sec-WebSocket-Protocol
+PROTOCOL_JSON = "json"
+PROTOCOL_MSGPACK = "msgpack"
+PROTOCOL_ZDICT = "alerts-zdict"
+
+# Preset zlib dictionary seeded with the keys and values every alert
+# repeats; small frames then compress several times better than plain
+# deflate. Clients mirror it with pako.Inflate({dictionary: ...}).
+ZDICT = (
+    b'{"type":"","title":"","message":"","severity":"info","metadata":'
+    b'{"metrics":[],"recommendations":[]},"timestamp":"'
+    b'"critical"warning"low"high"batch","items":['
+    b'"heartbeat","message":"connected"'
+)
+
+
+def _zdict_compress(payload: bytes) -> bytes:
+    """Deflate a JSON frame against the shared preset dictionary"""
+    compressor = zlib.compressobj(level=6, zdict=ZDICT)
+    return compressor.compress(payload) + compressor.flush()
+
+# Heartbeat frame shell precomputed once; only the timestamp is spliced in
+_HEARTBEAT_PREFIX = b'{"type":"heartbeat","message":"connected","timestamp":"'
+_HEARTBEAT_SUFFIX = b'"}'
+
+# Connected sockets mapped to their negotiated wire format
+active_connections: Dict[WebSocket, str] = {}
+
+# Coalescing queue: alerts buffer for a short window and ship as one
+# frame. Bounded so a wedged broadcaster surfaces as 503s instead of
+# unbounded memory growth.
+alert_queue: asyncio.Queue = asyncio.Queue(maxsize=1024)
+BATCH_WINDOW_SECONDS = 0.01
+ALERT_CHANNEL = "alerts"
+_broadcaster_task: Optional[asyncio.Task] = None
+_subscriber_task: Optional[asyncio.Task] = None
+_redis = None
+
+
+async def _publish(message: Dict[str, Any]):
+    """Publish through Redis so every worker fans out to its own clients"""
+    if _redis is not None:
+        try:
+            await _redis.publish(ALERT_CHANNEL, orjson.dumps(message))
+            return
+        except Exception as e:
+            logging.warning(f"Redis publish failed, broadcasting locally: {e}")
+    await broadcast(message)
+
+
+async def _subscriber_loop():
+    """Relay alerts published by any worker to this worker's sockets"""
+    pubsub = _redis.pubsub()
+    await pubsub.subscribe(ALERT_CHANNEL)
+    async for message in pubsub.listen():
+        if message["type"] == "message":
+            await broadcast(orjson.loads(message["data"]))
+
+
+async def _broadcast_loop():
+    """Drain queued alerts and emit them as single batched frames"""
+    while True:
+        first = await alert_queue.get()
+        await asyncio.sleep(BATCH_WINDOW_SECONDS)
+        items = [first]
+        while not alert_queue.empty():
+            items.append(alert_queue.get_nowait())
+        if len(items) == 1:
+            await _publish(items[0])
+        else:
+            await _publish({"type": "batch", "items": items})
+
+
+def start_broadcaster():
+    """Start the batching and Redis subscriber tasks (idempotent)"""
+    global _broadcaster_task, _subscriber_task, _redis
+    loop = asyncio.get_event_loop()
+    if _broadcaster_task is None or _broadcaster_task.done():
+        _broadcaster_task = loop.create_task(_broadcast_loop())
+    if aioredis is not None and _redis is None:
+        try:
+            _redis = aioredis.from_url(settings.redis_url)
+            _subscriber_task = loop.create_task(_subscriber_loop())
+        except Exception as e:
+            _redis = None
+            logging.warning(f"Redis unavailable, alerts will be worker-local: {e}")
+
+
 user_preferences: Dict[str, UserPreferences] = {}
 
-# Sample user data with email preferences
-default_users = {
-    "admin": UserPreferences(
-        email="admin@company.com",
-        email_notifications=True,
-        push_notifications=True,
-        sms_notifications=False
-    ),
-    "manager": UserPreferences(
-        email="manager@company.com", 
-        email_notifications=True,
-        push_notifications=True,
-        sms_notifications=True
-    )
-}
-user_preferences.update(default_users)
+
+@lru_cache(maxsize=1)
+def _default_users() -> Dict[str, UserPreferences]:
+    """Sample user data with email preferences (EmailStr validation runs
+    once per process instead of on every import/reload)"""
+    return {
+        "admin": UserPreferences(
+            email="admin@company.com",
+            email_notifications=True,
+            push_notifications=True,
+            sms_notifications=False
+        ),
+        "manager": UserPreferences(
+            email="manager@company.com",
+            email_notifications=True,
+            push_notifications=True,
+            sms_notifications=True
+        )
+    }
+
+
+@lru_cache(maxsize=1)
+def _default_preferences() -> UserPreferences:
+    """Shared default instance; frozen models are safe to hand out"""
+    return UserPreferences()
+
+
+user_preferences.update(_default_users())
+
+# Cached list of addresses with email notifications enabled; rebuilt
+# lazily after preference updates instead of scanned per alert
+_recipients_cache: Optional[List[str]] = None
+
+
+def _get_recipients() -> List[str]:
+    global _recipients_cache
+    if _recipients_cache is None:
+        _recipients_cache = [
+            prefs.email for prefs in user_preferences.values()
+            if prefs.email_notifications and prefs.email
+        ]
+    return _recipients_cache
 
 
 async def send_email_notification(alert: AlertMessage):
     """Send email notification for alerts"""
+    email_service = _email_service()
     if not email_service or not alert.send_email:
         return False
     
@@ -64,9 +203,7 @@ async def send_email_notification(alert: AlertMessage):
             recipients.extend(alert.email_recipients)
         else:
             # Send to all users with email notifications enabled
-            for user_id, prefs in user_preferences.items():
-                if prefs.email_notifications and prefs.email:
-                    recipients.append(prefs.email)
+            recipients.extend(_get_recipients())
         
         if not recipients:
             logging.info("No email recipients configured for alert")
@@ -99,67 +236,111 @@ async def send_email_notification(alert: AlertMessage):
         return False
 
 
+# A healthy client drains its socket in well under a second; TCP can
+# buffer megabytes before a send ever raises, so treat slower as dead
+SEND_TIMEOUT_SECONDS = 1.0
+
+
+async def _safe_send(connection: WebSocket, payload,
+                     text: bool = False) -> Optional[WebSocket]:
+    """Send to one socket; return the socket if it should be dropped"""
+    try:
+        send = connection.send_text if text else connection.send_bytes
+        await asyncio.wait_for(send(payload), SEND_TIMEOUT_SECONDS)
+    except Exception:
+        return connection
+    return None
+
+
 async def broadcast(message: Dict[str, Any]):
-    living_connections: List[WebSocket] = []
-    for connection in active_connections:
-        try:
-            await connection.send_json(message)
-            living_connections.append(connection)
-        except Exception:
-            # Drop dead connection
-            pass
-    active_connections.clear()
-    active_connections.extend(living_connections)
+    # Serialize once per wire format for the whole fanout. Default-
+    # protocol clients get TEXT frames (browsers JSON.parse the event
+    # data directly); the msgpack/zdict subprotocols are binary.
+    connections = list(active_connections.items())
+    json_bytes = orjson.dumps(message)
+    payloads = {PROTOCOL_JSON: json_bytes.decode()}
+    if any(protocol == PROTOCOL_MSGPACK for _, protocol in connections):
+        payloads[PROTOCOL_MSGPACK] = msgpack.packb(message, use_bin_type=True)
+    if any(protocol == PROTOCOL_ZDICT for _, protocol in connections):
+        payloads[PROTOCOL_ZDICT] = _zdict_compress(json_bytes)
+
+    dead = await asyncio.gather(
+        *(_safe_send(connection, payloads[protocol],
+                     text=protocol == PROTOCOL_JSON)
+          for connection, protocol in connections)
+    )
+    for connection in dead:
+        if connection is not None:
+            active_connections.pop(connection, None)
 
 
 @router.websocket("/ws/alerts")
 async def alerts_ws(websocket: WebSocket):
-    await websocket.accept()
-    active_connections.append(websocket)
+    requested = websocket.headers.get("sec-websocket-protocol", "")
+    if PROTOCOL_ZDICT in requested:
+        protocol = PROTOCOL_ZDICT
+    elif PROTOCOL_MSGPACK in requested:
+        protocol = PROTOCOL_MSGPACK
+    else:
+        protocol = PROTOCOL_JSON
+    await websocket.accept(subprotocol=protocol if protocol != PROTOCOL_JSON else None)
+    active_connections[websocket] = protocol
     try:
-        await websocket.send_json({
-            "type": "heartbeat",
-            "message": "connected",
-            "timestamp": datetime.utcnow().isoformat()
-        })
+        now = datetime.now(timezone.utc).isoformat()
+        if protocol == PROTOCOL_MSGPACK:
+            await websocket.send_bytes(msgpack.packb(
+                {"type": "heartbeat", "message": "connected", "timestamp": now},
+                use_bin_type=True
+            ))
+        else:
+            heartbeat = _HEARTBEAT_PREFIX + now.encode() + _HEARTBEAT_SUFFIX
+            if protocol == PROTOCOL_ZDICT:
+                await websocket.send_bytes(_zdict_compress(heartbeat))
+            else:
+                await websocket.send_text(heartbeat.decode())
         while True:
             # Keep connection alive; optionally receive pings from client
             _ = await websocket.receive_text()
     except WebSocketDisconnect:
-        if websocket in active_connections:
-            active_connections.remove(websocket)
+        active_connections.pop(websocket, None)
 
 
 @router.post("/publish")
-async def publish_alert(alert: AlertMessage):
-    payload = {
-        "type": alert.type,
-        "title": alert.title,
-        "message": alert.message,
-        "severity": alert.severity,
-        "metadata": alert.metadata,
-        "timestamp": datetime.utcnow().isoformat()
-    }
-    
-    # Send web notifications
-    await broadcast(payload)
-    
-    # Send email notifications if enabled
-    email_sent = False
-    if alert.send_email:
-        email_sent = await send_email_notification(alert)
+async def publish_alert(alert: AlertMessage, background: BackgroundTasks):
+    # Rust-backed serializer dumps all fields in one pass
+    payload = alert.model_dump(mode="json", exclude={"send_email", "email_recipients"})
+    payload["timestamp"] = datetime.now(timezone.utc).isoformat()
+
+    # Send web notifications; critical alerts skip the batching window
+    start_broadcaster()
+    if alert.severity == "critical":
+        await _publish(payload)
+    else:
+        try:
+            alert_queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            raise HTTPException(status_code=503, detail="Alert queue full - try again shortly")
     
+    # Queue email notifications so the SMTP round-trip happens after the
+    # response instead of inside the caller's latency budget
+    email_queued = False
+    if alert.send_email and get_email_service is not None:
+        background.add_task(send_email_notification, alert)
+        email_queued = True
+
     return {
         "delivered": len(active_connections),
-        "email_sent": email_sent,
-        "email_recipients": len(alert.email_recipients) if alert.email_recipients else len([u for u in user_preferences.values() if u.email_notifications])
+        "email_sent": email_queued,
+        "email_recipients": len(alert.email_recipients) if alert.email_recipients else len(_get_recipients())
     }
 
 
 @router.post("/user-preferences/{user_id}")
 async def update_user_preferences(user_id: str, preferences: UserPreferences):
     """Update user notification preferences"""
+    global _recipients_cache
     user_preferences[user_id] = preferences
+    _recipients_cache = None
     return {"message": f"Preferences updated for user {user_id}", "preferences": preferences}
 
 
@@ -168,7 +349,7 @@ async def get_user_preferences(user_id: str):
     """Get user notification preferences"""
     if user_id not in user_preferences:
         # Return default preferences
-        return UserPreferences()
+        return _default_preferences()
     return user_preferences[user_id]
 
 
@@ -178,6 +359,7 @@ async def test_email_notification(
     test_type: str = "alert"
 ):
     """Send test email notification"""
+    email_service = _email_service()
     if not email_service:
         raise HTTPException(status_code=503, detail="Email service not configured")
     
@@ -266,7 +448,7 @@ async def configure_email_provider(
     smtp_port: Optional[int] = None
 ):
     """Configure email provider settings"""
-    if not email_service:
+    if get_email_service is None:
         raise HTTPException(status_code=503, detail="Email service not available")
     
     try:
@@ -288,31 +470,35 @@ async def configure_email_provider(
         raise HTTPException(status_code=500, detail=f"Error configuring email provider: {str(e)}")
 
 
+# Static catalogue of supported providers; built once instead of per request
+EMAIL_PROVIDERS = {
+    "providers": [
+        {
+            "name": "gmail",
+            "display_name": "Gmail",
+            "description": "Google Gmail with App Password",
+            "setup_required": ["email", "app_password"]
+        },
+        {
+            "name": "outlook",
+            "display_name": "Outlook/Hotmail",
+            "description": "Microsoft Outlook/Hotmail",
+            "setup_required": ["email", "password"]
+        },
+        {
+            "name": "custom",
+            "display_name": "Custom SMTP",
+            "description": "Custom SMTP server",
+            "setup_required": ["email", "password", "smtp_server", "smtp_port"]
+        }
+    ]
+}
+
+
 @router.get("/email-providers")
 async def get_available_email_providers():
     """Get list of available email providers"""
-    return {
-        "providers": [
-            {
-                "name": "gmail",
-                "display_name": "Gmail",
-                "description": "Google Gmail with App Password",
-                "setup_required": ["email", "app_password"]
-            },
-            {
-                "name": "outlook",
-                "display_name": "Outlook/Hotmail",
-                "description": "Microsoft Outlook/Hotmail",
-                "setup_required": ["email", "password"]
-            },
-            {
-                "name": "custom",
-                "display_name": "Custom SMTP",
-                "description": "Custom SMTP server",
-                "setup_required": ["email", "password", "smtp_server", "smtp_port"]
-            }
-        ]
-    }
+    return EMAIL_PROVIDERS
 
 
 
@@ -1,24 +1,114 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from typing import Dict, Any
-
-from ml_pipeline.ml_service import ml_service
+from typing import Dict, Any, List
+import asyncio
+import msgpack
+from app.core.cache import cached
+from ml_pipeline.ml_service import get_ml_service
 
 router = APIRouter()
 
+# Concurrent single-row conversion requests coalesce into one batched
+# model call: up to this many rows per batch, drained within the window
+MAX_COALESCE_BATCH = 64
+COALESCE_WINDOW_SECONDS = 0.005
+
+_conversion_queue: asyncio.Queue = None
+_coalescer_task = None
+
+
+async def _conversion_coalescer():
+    """Drain queued (features, future) pairs into batched predictions"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _conversion_queue.get()]
+        deadline = loop.time() + COALESCE_WINDOW_SECONDS
+        while len(batch) < MAX_COALESCE_BATCH:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_conversion_queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        rows = [features for features, _ in batch]
+        result = await run_in_threadpool(get_ml_service().predict_conversion_batch, rows)
+        if "error" in result:
+            for _, future in batch:
+                if not future.done():
+                    future.set_result({"error": result["error"]})
+        else:
+            for (_, future), prediction in zip(batch, result["predictions"]):
+                if not future.done():
+                    future.set_result(prediction)
+
+
+def _ensure_coalescer():
+    """Start the coalescing loop lazily on the running event loop"""
+    global _conversion_queue, _coalescer_task
+    if _conversion_queue is None:
+        _conversion_queue = asyncio.Queue()
+        _coalescer_task = asyncio.create_task(_conversion_coalescer())
+
 
 class FeaturesPayload(BaseModel):
     features: Dict[str, Any]
 
 
+class BatchFeaturesPayload(BaseModel):
+    features: List[Dict[str, Any]]
+
+
 @router.get("/status")
 async def get_model_status():
-    return ml_service.get_model_status()
+    """Get model status (cached for 5 seconds, shared across workers)"""
+    async def load():
+        return get_ml_service().get_model_status()
+    return await cached("ml:status", 5, load)
 
 
 @router.post("/predict/conversion")
 async def predict_conversion(payload: FeaturesPayload):
-    result = ml_service.predict_conversion(payload.features)
+    _ensure_coalescer()
+    future = asyncio.get_running_loop().create_future()
+    await _conversion_queue.put((payload.features, future))
+    result = await future
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+    return result
+
+
+@router.post("/predict/conversion/batch")
+async def predict_conversion_batch(payload: BatchFeaturesPayload):
+    result = await run_in_threadpool(get_ml_service().predict_conversion_batch, payload.features)
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+    return result
+
+
+@router.post("/predict/churn/batch")
+async def predict_churn_batch(payload: BatchFeaturesPayload):
+    result = await run_in_threadpool(get_ml_service().predict_churn_batch, payload.features)
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+    return result
+
+
+@router.post("/predict/roi/batch")
+async def predict_roi_batch(payload: BatchFeaturesPayload):
+    result = await run_in_threadpool(get_ml_service().predict_roi_batch, payload.features)
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+    return result
+
+
+@router.post("/predict/campaign-performance/batch")
+async def predict_campaign_performance_batch(payload: BatchFeaturesPayload):
+    result = await run_in_threadpool(
+        get_ml_service().predict_campaign_performance_batch, payload.features
+    )
     if "error" in result:
         raise HTTPException(status_code=400, detail=result["error"])
     return result
@@ -26,7 +116,7 @@ async def predict_conversion(payload: FeaturesPayload):
 
 @router.post("/predict/churn")
 async def predict_churn(payload: FeaturesPayload):
-    result = ml_service.predict_churn(payload.features)
+    result = await run_in_threadpool(get_ml_service().predict_churn, payload.features)
     if "error" in result:
         raise HTTPException(status_code=400, detail=result["error"])
     return result
@@ -34,7 +124,7 @@ async def predict_churn(payload: FeaturesPayload):
 
 @router.post("/predict/roi")
 async def predict_roi(payload: FeaturesPayload):
-    result = ml_service.predict_roi(payload.features)
+    result = await run_in_threadpool(get_ml_service().predict_roi, payload.features)
     if "error" in result:
         raise HTTPException(status_code=400, detail=result["error"])
     return result
@@ -42,10 +132,42 @@ async def predict_roi(payload: FeaturesPayload):
 
 @router.post("/predict/campaign-performance")
 async def predict_campaign_performance(payload: FeaturesPayload):
-    result = ml_service.predict_campaign_performance(payload.features)
+    result = await run_in_threadpool(get_ml_service().predict_campaign_performance, payload.features)
     if "error" in result:
         raise HTTPException(status_code=400, detail=result["error"])
     return result
 
 
+# Streaming dispatch table: model name -> service method name (bound
+# lazily so importing the router doesn't construct the service)
+_PREDICTOR_NAMES = {
+    "conversion": "predict_conversion",
+    "churn": "predict_churn",
+    "roi": "predict_roi",
+    "campaign_performance": "predict_campaign_performance",
+}
+
+
+@router.websocket("/stream")
+async def ml_stream(websocket: WebSocket):
+    """Score many requests over one connection instead of per-call HTTP.
+
+    Clients send msgpack frames of {"model": ..., "features": {...}} and
+    receive the prediction result as a msgpack frame on the same socket.
+    """
+    await websocket.accept()
+    try:
+        while True:
+            request = msgpack.unpackb(await websocket.receive_bytes(), raw=False)
+            method = _PREDICTOR_NAMES.get(request.get("model"))
+            if method is None:
+                result = {"error": f"Unknown model '{request.get('model')}'"}
+            else:
+                predictor = getattr(get_ml_service(), method)
+                result = await run_in_threadpool(predictor, request.get("features", {}))
+            await websocket.send_bytes(msgpack.packb(result, use_bin_type=True))
+    except WebSocketDisconnect:
+        pass
+
+
 
@@ -1,47 +1,111 @@
 from fastapi import APIRouter, HTTPException, Query
 from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+import asyncio
+import logging
+import time
 
-from powerbi_integration.powerbi_service import powerbi_service
+from app.core.cache import cached, invalidate
+from app.core.config import settings
+from powerbi_integration.powerbi_service import get_powerbi_service
 
 router = APIRouter()
 
 
+# Cached status payload: (response, 5-second time bucket)
+_status_cache = (None, -1)
+
+# Read TTLs for the worker-shared cache; dashboard polling then hits
+# Redis instead of a Power BI REST round-trip
+CACHE_TTL = 60
+EMBED_CONFIG_TTL = 1800  # embed tokens live ~1h; stay safely under expiry
+
+# Re-warm listings just before their TTL expires so dashboards always
+# hit a hot cache instead of paying the first-user cold miss
+PREFETCH_INTERVAL_SECONDS = CACHE_TTL - 15
+
+
+async def prefetch_loop():
+    """Keep the reports and datasets listings warm (started from lifespan)"""
+    workspace_ids = {None}
+    if settings.powerbi_workspace_id:
+        workspace_ids.add(settings.powerbi_workspace_id)
+    while True:
+        for workspace_id in workspace_ids:
+            try:
+                await list_reports(workspace_id)
+                await list_datasets(workspace_id)
+            except Exception as e:
+                logging.warning(f"Power BI prefetch failed for workspace {workspace_id}: {e}")
+        await asyncio.sleep(PREFETCH_INTERVAL_SECONDS)
+
+
 @router.get("/status")
 async def get_powerbi_status():
-    return powerbi_service.get_service_status()
+    """Get Power BI service status (result cached for 5 seconds)"""
+    global _status_cache
+    bucket = int(time.time() // 5)
+    if _status_cache[1] == bucket:
+        return _status_cache[0]
+    # The service is resolved inside the threadpool throughout this
+    # router: first construction runs a blocking OAuth round trip that
+    # must not stall the event loop
+    status = await run_in_threadpool(lambda: get_powerbi_service().get_service_status())
+    _status_cache = (status, bucket)
+    return status
 
 
 @router.get("/reports")
 async def list_reports(workspace_id: Optional[str] = None):
-    return powerbi_service.get_reports(workspace_id)
+    async def load():
+        return await run_in_threadpool(lambda: get_powerbi_service().get_reports(workspace_id))
+    return await cached(f"powerbi:reports:{workspace_id}", CACHE_TTL, load)
 
 
 @router.get("/datasets")
 async def list_datasets(workspace_id: Optional[str] = None):
-    return powerbi_service.get_datasets(workspace_id)
+    async def load():
+        return await run_in_threadpool(lambda: get_powerbi_service().get_datasets(workspace_id))
+    return await cached(f"powerbi:datasets:{workspace_id}", CACHE_TTL, load)
 
 
 @router.get("/embed-config")
 async def get_embed_config(report_id: Optional[str] = None,
                            workspace_id: Optional[str] = None,
                            user_email: Optional[str] = None):
-    config = powerbi_service.create_embed_config(report_id, workspace_id, user_email)
-    if "error" in config:
-        raise HTTPException(status_code=400, detail=config["error"])
-    return config
+    async def load():
+        config = await run_in_threadpool(
+            lambda: get_powerbi_service().create_embed_config(report_id, workspace_id, user_email)
+        )
+        if "error" in config:
+            raise HTTPException(status_code=400, detail=config["error"])
+        return config
+    return await cached(
+        f"powerbi:embed_config:{workspace_id}:{report_id}:{user_email}",
+        EMBED_CONFIG_TTL, load
+    )
 
 
 @router.post("/datasets/{dataset_id}/refresh")
 async def refresh_dataset(dataset_id: str, workspace_id: Optional[str] = None):
-    ok = powerbi_service.refresh_dataset(dataset_id, workspace_id)
+    ok = await run_in_threadpool(lambda: get_powerbi_service().refresh_dataset(dataset_id, workspace_id))
     if not ok:
         raise HTTPException(status_code=400, detail="Failed to initiate dataset refresh")
+    # Refresh invalidates what the read endpoints may have cached
+    await invalidate(f"powerbi:datasets:{workspace_id}")
+    await invalidate(f"powerbi:refresh_history:{workspace_id}:{dataset_id}")
     return {"status": "refresh_started", "dataset_id": dataset_id}
 
 
 @router.get("/datasets/{dataset_id}/refresh-history")
 async def dataset_refresh_history(dataset_id: str, workspace_id: Optional[str] = None):
-    return powerbi_service.get_dataset_refresh_history(dataset_id, workspace_id)
+    async def load():
+        return await run_in_threadpool(
+            lambda: get_powerbi_service().get_dataset_refresh_history(dataset_id, workspace_id)
+        )
+    return await cached(
+        f"powerbi:refresh_history:{workspace_id}:{dataset_id}", CACHE_TTL, load
+    )
 
 
 
@@ -5,19 +5,22 @@ Supports multiple email providers with fallback options
 
 import smtplib
 import logging
-from email.mime.text import MimeText
-from email.mime.multipart import MimeMultipart
-from email.mime.base import MimeBase
+import re
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from email.mime.base import MIMEBase
 from email import encoders
+from functools import cached_property, lru_cache
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, field_validator
 from datetime import datetime
 import asyncio
+import random
+import time
 import aiosmtplib
-from jinja2 import Template
+from jinja2 import Environment, DictLoader, TemplateNotFound, select_autoescape
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Log configuration is the application's job (main.py), not a library's
 logger = logging.getLogger(__name__)
 
 class EmailConfig(BaseModel):
@@ -29,16 +32,181 @@ class EmailConfig(BaseModel):
     use_tls: bool = True
     use_ssl: bool = False
 
+# Lightweight shape check compiled once; the full email-validator/idna
+# grammar that EmailStr runs costs real CPU per address on bulk paths.
+# Strict validation still happens at the API boundary (see alerts.py).
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
 class EmailMessage(BaseModel):
     """Email message structure"""
-    to_emails: List[EmailStr]
+    to_emails: List[str]
     subject: str
     html_content: str
     text_content: Optional[str] = None
-    cc_emails: Optional[List[EmailStr]] = None
-    bcc_emails: Optional[List[EmailStr]] = None
+    cc_emails: Optional[List[str]] = None
+    bcc_emails: Optional[List[str]] = None
     attachments: Optional[List[Dict[str, Any]]] = None
 
+    @field_validator('to_emails', 'cc_emails', 'bcc_emails')
+    @classmethod
+    def _check_addresses(cls, addresses):
+        if addresses:
+            for address in addresses:
+                if not _EMAIL_RE.match(address):
+                    raise ValueError(f"Invalid email address: {address}")
+        return addresses
+
+# Per-attempt timeouts so a hung provider can't park a send forever
+CONNECT_TIMEOUT_SECONDS = 5.0
+SEND_TIMEOUT_SECONDS = 10.0
+
+# Transient SMTP status codes worth retrying; everything else (auth
+# failures, permanent rejects) goes straight to the circuit breaker
+_RETRYABLE_SMTP_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """True for transient failures that a short backoff may fix"""
+    if isinstance(exc, (asyncio.TimeoutError, aiosmtplib.SMTPServerDisconnected)):
+        return True
+    if isinstance(exc, aiosmtplib.SMTPResponseException):
+        return exc.code in _RETRYABLE_SMTP_CODES
+    return False
+
+
+async def _retry(fn, attempts: int = 3, initial: float = 0.5,
+                 factor: float = 2.0, max_delay: float = 5.0):
+    """Run fn() with exponential backoff plus jitter on transient errors"""
+    for attempt in range(attempts):
+        try:
+            return await fn()
+        except Exception as e:
+            if attempt == attempts - 1 or not _is_retryable(e):
+                raise
+            delay = min(max_delay, initial * factor ** attempt) + random.random()
+            logger.warning("Transient email failure (%s), retrying in %.1fs", e, delay)
+            await asyncio.sleep(delay)
+
+
+class ProviderBreaker:
+    """
+    Per-provider circuit breaker (CLOSED/OPEN/HALF_OPEN)
+
+    After failure_threshold consecutive failures the provider is skipped
+    in O(1) until reset_timeout elapses, when one probe send is allowed.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def allow(self) -> bool:
+        """True if a send may be attempted against this provider"""
+        if self.failures < self.failure_threshold:
+            return True
+        # OPEN until the cool-down elapses, then HALF_OPEN probe
+        return time.monotonic() - self.opened_at >= self.reset_timeout
+
+    def on_success(self):
+        self.failures = 0
+
+    def on_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class SMTPPool:
+    """
+    Bounded pool of authenticated SMTP connections per provider
+
+    Parallel sends pipeline over several sockets instead of serializing
+    on one; connections are recycled after max_messages_per_conn sends
+    to stay under provider per-connection ceilings.
+    """
+
+    def __init__(self, max_size: int = 5, max_messages_per_conn: int = 100):
+        self.max_size = max_size
+        self.max_messages_per_conn = max_messages_per_conn
+        self._idle: Dict[str, asyncio.Queue] = {}
+        # One permit per checked-out connection; bounds the pool
+        # atomically and wakes waiters when a connection is discarded
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+
+    def _queue(self, provider: str) -> asyncio.Queue:
+        return self._idle.setdefault(provider, asyncio.Queue())
+
+    def _slot(self, provider: str) -> asyncio.Semaphore:
+        return self._slots.setdefault(provider, asyncio.Semaphore(self.max_size))
+
+    async def _connect(self, config: EmailConfig) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(
+            hostname=config.smtp_server,
+            port=config.smtp_port,
+            use_tls=config.use_tls
+        )
+        await asyncio.wait_for(smtp.connect(), timeout=CONNECT_TIMEOUT_SECONDS)
+        await asyncio.wait_for(
+            smtp.login(config.username, config.password),
+            timeout=CONNECT_TIMEOUT_SECONDS
+        )
+        return smtp
+
+    async def acquire(self, provider: str, config: EmailConfig):
+        """Return a (connection, message_count) pair for the provider
+
+        Capacity is guarded by a semaphore taken before connecting, so
+        concurrent acquires cannot overshoot max_size and waiters are
+        woken whether the freed connection was returned or discarded.
+        """
+        queue = self._queue(provider)
+        await self._slot(provider).acquire()
+        try:
+            while True:
+                try:
+                    smtp, count = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                try:
+                    await smtp.noop()
+                    return smtp, count
+                except Exception:
+                    # Dead idle connection; it holds no permit, drop it
+                    continue
+            return await self._connect(config), 0
+        except BaseException:
+            self._slot(provider).release()
+            raise
+
+    async def release(self, provider: str, smtp: aiosmtplib.SMTP,
+                      count: int, discard: bool = False):
+        """Return a connection to the pool, recycling worn or broken ones"""
+        count += 1
+        try:
+            if discard or count >= self.max_messages_per_conn:
+                try:
+                    await smtp.quit()
+                except Exception:
+                    pass
+            else:
+                self._queue(provider).put_nowait((smtp, count))
+        finally:
+            self._slot(provider).release()
+
+    async def aclose(self):
+        """Quit every idle connection (called on app shutdown)"""
+        for queue in self._idle.values():
+            while not queue.empty():
+                smtp, _ = queue.get_nowait()
+                try:
+                    await smtp.quit()
+                except Exception:
+                    pass
+
+
 class EmailService:
     """
     Professional Email Service with multiple provider support
@@ -76,11 +244,37 @@ class EmailService:
             )
         }
         self.default_provider = 'gmail'
-        self.email_templates = self._load_templates()
+        # Pooled, authenticated SMTP connections per provider; the
+        # TLS+AUTH handshake is paid once per connection, not per email
+        self._smtp_pool = SMTPPool(max_size=5, max_messages_per_conn=100)
+        # One breaker per provider so outages fail fast instead of
+        # cascading through full connect timeouts on every send
+        self._breakers: Dict[str, ProviderBreaker] = {}
+
+    async def aclose(self):
+        """Quit all pooled SMTP connections (called on app shutdown)"""
+        await self._smtp_pool.aclose()
+
+    @cached_property
+    def email_templates(self) -> Dict[str, str]:
+        return self._load_templates()
+
+    @cached_property
+    def _env(self) -> Environment:
+        # One shared Environment compiles each template to bytecode once;
+        # renders afterwards skip the lex/parse/compile entirely
+        return Environment(
+            loader=DictLoader(self.email_templates),
+            autoescape=select_autoescape(['html']),
+            trim_blocks=True,
+            lstrip_blocks=True,
+            auto_reload=False,
+            cache_size=-1
+        )
 
     def _load_templates(self) -> Dict[str, str]:
         """Load email templates for different notification types"""
-        return {
+        templates = {
             'alert': """
             <!DOCTYPE html>
             <html>
@@ -293,92 +487,194 @@ class EmailService:
             </html>
             """
         }
+        # One-time minify at load: the indented source is 3-5 KB of
+        # whitespace per email, shipped to SMTP for every recipient
+        return {
+            name: re.sub(r"\s{2,}", " ", re.sub(r">\s+<", "><", template))
+            for name, template in templates.items()
+        }
 
     async def send_email_async(self, message: EmailMessage, provider: str = None) -> bool:
         """
         Send email asynchronously with fallback support
         """
-        provider = provider or self.default_provider
-        config = self.providers.get(provider)
-        
-        if not config:
-            logger.error(f"Email provider '{provider}' not configured")
+        primary = provider or self.default_provider
+        if primary not in self.providers:
+            logger.error("Email provider '%s' not configured", primary)
             return False
 
         try:
-            # Create message
-            msg = MimeMultipart('alternative')
-            msg['Subject'] = message.subject
-            msg['From'] = config.username
+            # Compose once, off the loop: base64-encoding multi-MB
+            # attachments would otherwise stall every in-flight send.
+            # Only the From header varies per provider.
+            msg = await asyncio.get_running_loop().run_in_executor(
+                None, self._compose_mime, message, self.providers[primary].username
+            )
+
+            # Prepare recipient list
+            recipients = list(message.to_emails)
+            if message.cc_emails:
+                recipients.extend(message.cc_emails)
+            if message.bcc_emails:
+                recipients.extend(message.bcc_emails)
+
+        except Exception as e:
+            logger.error("Failed to compose email: %s", e)
+            return False
+
+        # Explicit failover loop; each provider's breaker is consulted so
+        # a known-bad provider costs a dict lookup, not a connect timeout
+        candidates = [primary] + [p for p in self.providers if p != primary]
+        for candidate in candidates:
+            breaker = self._breakers.setdefault(candidate, ProviderBreaker())
+            if not breaker.allow():
+                logger.warning("Skipping provider %s: circuit open", candidate)
+                continue
+
+            config = self.providers[candidate]
+            if msg['From'] != config.username:
+                msg.replace_header('From', config.username)
+
+            try:
+                await _retry(lambda: self._send_once(candidate, config, msg, recipients))
+            except Exception as e:
+                breaker.on_failure()
+                logger.error("Failed to send email via %s: %s", candidate, e)
+                continue
+
+            breaker.on_success()
+            logger.info("Email sent successfully to %d recipients via %s", len(recipients), candidate)
+            return True
+
+        return False
+
+    def _compose_mime(self, message: EmailMessage, sender: str,
+                      with_to: bool = True) -> MIMEMultipart:
+        """Build the MIME tree once; attachments are base64-encoded here
+        exactly once, however many times the message is sent"""
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = message.subject
+        msg['From'] = sender
+
+        if with_to:
             msg['To'] = ', '.join(message.to_emails)
-            
             if message.cc_emails:
                 msg['Cc'] = ', '.join(message.cc_emails)
 
-            # Add text and HTML parts
-            if message.text_content:
-                text_part = MimeText(message.text_content, 'plain')
-                msg.attach(text_part)
-            
-            html_part = MimeText(message.html_content, 'html')
-            msg.attach(html_part)
-
-            # Add attachments if any
-            if message.attachments:
-                for attachment in message.attachments:
-                    part = MimeBase('application', 'octet-stream')
-                    part.set_payload(attachment['content'])
-                    encoders.encode_base64(part)
-                    part.add_header(
-                        'Content-Disposition',
-                        f'attachment; filename= {attachment["filename"]}'
-                    )
-                    msg.attach(part)
-
-            # Send email
-            async with aiosmtplib.SMTP(
-                hostname=config.smtp_server,
-                port=config.smtp_port,
-                use_tls=config.use_tls
-            ) as smtp:
-                await smtp.login(config.username, config.password)
-                
-                # Prepare recipient list
-                recipients = list(message.to_emails)
-                if message.cc_emails:
-                    recipients.extend(message.cc_emails)
-                if message.bcc_emails:
-                    recipients.extend(message.bcc_emails)
-                
-                await smtp.send_message(msg, recipients=recipients)
-                
-            logger.info(f"Email sent successfully to {len(recipients)} recipients via {provider}")
-            return True
+        # Add text and HTML parts
+        if message.text_content:
+            msg.attach(MIMEText(message.text_content, 'plain'))
+        msg.attach(MIMEText(message.html_content, 'html'))
 
-        except Exception as e:
-            logger.error(f"Failed to send email via {provider}: {str(e)}")
-            
-            # Try fallback providers
-            fallback_providers = [p for p in self.providers.keys() if p != provider]
-            for fallback in fallback_providers:
-                logger.info(f"Trying fallback provider: {fallback}")
+        # Add attachments if any
+        if message.attachments:
+            for attachment in message.attachments:
+                part = MIMEBase('application', 'octet-stream')
+                part.set_payload(attachment['content'])
+                encoders.encode_base64(part)
+                part.add_header(
+                    'Content-Disposition',
+                    f'attachment; filename= {attachment["filename"]}'
+                )
+                msg.attach(part)
+
+        return msg
+
+    def _compose_bytes(self, message: EmailMessage, sender: str) -> bytes:
+        """Compose and serialize in one executor hop for the bulk path"""
+        return self._compose_mime(message, sender, with_to=False).as_bytes()
+
+    async def _send_once(self, provider: str, config: EmailConfig,
+                         msg: MIMEMultipart, recipients: List[str]):
+        """One pooled send attempt with a hard per-attempt deadline"""
+        smtp, count = await self._smtp_pool.acquire(provider, config)
+        try:
+            await asyncio.wait_for(
+                smtp.send_message(msg, recipients=recipients),
+                timeout=SEND_TIMEOUT_SECONDS
+            )
+        except Exception:
+            # Connection is suspect; drop it so the next send dials fresh
+            await self._smtp_pool.release(provider, smtp, count, discard=True)
+            raise
+        await self._smtp_pool.release(provider, smtp, count)
+
+    async def send_bulk_async(self, message: EmailMessage, recipients: List[str],
+                              provider: str = None) -> Dict[str, bool]:
+        """
+        Send one message to many recipients, one DATA transaction each
+
+        The MIME body is composed once and a single pooled connection is
+        reused for the whole batch, so cost per recipient is one DATA
+        instead of connect+auth+DATA -- and recipients never see each
+        other's addresses. For batches of 30 or more the job aborts once
+        a third of attempts have failed, so a provider meltdown doesn't
+        burn the retry budget on every remaining address.
+        """
+        provider = provider or self.default_provider
+        config = self.providers.get(provider)
+        if not config:
+            logger.error("Email provider '%s' not configured", provider)
+            return {recipient: False for recipient in recipients}
+
+        # Serialize the MIME tree to bytes once, off the loop; per
+        # recipient we only prepend a To header to the cached bytes
+        base_payload = await asyncio.get_running_loop().run_in_executor(
+            None, self._compose_bytes, message, config.username
+        )
+
+        results: Dict[str, bool] = {}
+        failures = 0
+        abort_threshold = len(recipients) / 3 if len(recipients) >= 30 else None
+
+        smtp, count = await self._smtp_pool.acquire(provider, config)
+        sent = 0
+        try:
+            for recipient in recipients:
+                if abort_threshold is not None and failures >= abort_threshold:
+                    logger.error("Aborting bulk send via %s: %d/%d attempts failed",
+                                 provider, failures, len(results))
+                    break
+
+                payload = b'To: ' + recipient.encode() + b'\r\n' + base_payload
                 try:
-                    return await self.send_email_async(message, fallback)
-                except Exception as fe:
-                    logger.error(f"Fallback provider {fallback} also failed: {str(fe)}")
-                    continue
-            
-            return False
+                    await asyncio.wait_for(
+                        smtp.sendmail(config.username, [recipient], payload),
+                        timeout=SEND_TIMEOUT_SECONDS
+                    )
+                    results[recipient] = True
+                    sent += 1
+                except Exception as e:
+                    results[recipient] = False
+                    failures += 1
+                    logger.error("Bulk send to %s failed: %s", recipient, e)
+                    if _is_retryable(e):
+                        # Connection may be dead; dial a fresh one and go on
+                        await self._smtp_pool.release(provider, smtp, count + sent,
+                                                      discard=True)
+                        smtp = None
+                        smtp, count = await self._smtp_pool.acquire(provider, config)
+                        sent = 0
+        finally:
+            if smtp is not None:
+                await self._smtp_pool.release(provider, smtp, count + sent)
+
+        # Recipients skipped by the abort guard count as failed
+        for recipient in recipients:
+            results.setdefault(recipient, False)
+
+        logger.info("Bulk send via %s: %d/%d delivered",
+                    provider, sum(results.values()), len(recipients))
+        return results
 
     def render_template(self, template_name: str, **kwargs) -> str:
         """
         Render email template with provided data
         """
-        template_content = self.email_templates.get(template_name)
-        if not template_content:
+        try:
+            template = self._env.get_template(template_name)
+        except TemplateNotFound:
             raise ValueError(f"Template '{template_name}' not found")
-        
-        template = Template(template_content)
         return template.render(**kwargs)
 
     async def send_alert_email(self, 
@@ -459,7 +755,7 @@ class EmailService:
         Configure or update email provider settings
         """
         self.providers[provider_name] = config
-        logger.info(f"Email provider '{provider_name}' configured successfully")
+        logger.info("Email provider '%s' configured successfully", provider_name)
 
     def set_default_provider(self, provider_name: str):
         """
@@ -467,12 +763,23 @@ class EmailService:
         """
         if provider_name in self.providers:
             self.default_provider = provider_name
-            logger.info(f"Default email provider set to '{provider_name}'")
+            logger.info("Default email provider set to '%s'", provider_name)
         else:
             raise ValueError(f"Provider '{provider_name}' not configured")
 
-# Global email service instance
-email_service = EmailService()
+@lru_cache(maxsize=1)
+def get_email_service() -> EmailService:
+    """Global email service instance, built on first use"""
+    return EmailService()
+
+
+def __getattr__(name):
+    # PEP 562: `from email_service import email_service` still works,
+    # but plain module importers no longer pay for four EmailConfig
+    # validations and the template dict at import time
+    if name == 'email_service':
+        return get_email_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Quick setup functions for popular providers
 def setup_gmail(email: str, app_password: str):
@@ -484,8 +791,9 @@ def setup_gmail(email: str, app_password: str):
         password=app_password,
         use_tls=True
     )
-    email_service.configure_provider('gmail', config)
-    email_service.set_default_provider('gmail')
+    service = get_email_service()
+    service.configure_provider('gmail', config)
+    service.set_default_provider('gmail')
 
 def setup_outlook(email: str, password: str):
     """Quick setup for Outlook"""
@@ -496,8 +804,9 @@ def setup_outlook(email: str, password: str):
         password=password,
         use_tls=True
     )
-    email_service.configure_provider('outlook', config)
-    email_service.set_default_provider('outlook')
+    service = get_email_service()
+    service.configure_provider('outlook', config)
+    service.set_default_provider('outlook')
 
 def setup_custom_smtp(email: str, password: str, smtp_server: str, smtp_port: int = 587):
     """Quick setup for custom SMTP"""
@@ -508,5 +817,6 @@ def setup_custom_smtp(email: str, password: str, smtp_server: str, smtp_port: in
         password=password,
         use_tls=True
     )
-    email_service.configure_provider('custom', config)
-    email_service.set_default_provider('custom')
+    service = get_email_service()
+    service.configure_provider('custom', config)
+    service.set_default_provider('custom')
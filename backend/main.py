@@ -1,37 +1,55 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, status, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+from functools import lru_cache
+import asyncio
+import hashlib
+import orjson
 import uvicorn
 import os
 from dotenv import load_dotenv
 
 from app.routers import auth, users, campaigns, analytics, ml_predictions, powerbi, alerts
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import init_db
 from app.core.security import get_current_user
 
 # Load environment variables
 load_dotenv()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     print("🚀 Starting Precision Marketing Intelligence Platform...")
+    await init_db()
+    alerts.start_broadcaster()
+    prefetch_task = asyncio.create_task(powerbi.prefetch_loop())
+    # Optional: replay a JSON-lines query log to pre-warm the ML
+    # prediction cache before traffic arrives
+    warmup_log = os.getenv("PMI_WARMUP_LOG")
+    if warmup_log and os.path.exists(warmup_log):
+        from ml_pipeline.ml_service import warmup_from_log
+        await asyncio.get_running_loop().run_in_executor(None, warmup_from_log, warmup_log)
     yield
+    prefetch_task.cancel()
     # Shutdown
     print("🛑 Shutting down Precision Marketing Intelligence Platform...")
+    from app.services.email_service import get_email_service
+    # Close the SMTP pool only if the service was ever constructed;
+    # resolving it here just to close it would build it at shutdown
+    if get_email_service.cache_info().currsize:
+        await get_email_service().aclose()
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Precision Marketing Intelligence Platform",
     description="AI + BI platform that helps companies optimize marketing campaigns with predictive insights and interactive dashboards",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -55,26 +73,55 @@ app.include_router(ml_predictions.router, prefix="/api/ml", tags=["ML Prediction
 app.include_router(powerbi.router, prefix="/api/powerbi", tags=["Power BI"])
 app.include_router(alerts.router, prefix="/api/alerts", tags=["Alerts"])
 
-@app.get("/")
-async def root():
-    return {
+# Constant payloads serialized once at import; handlers serve the
+# cached bytes with validators so clients and proxies can revalidate
+# with a 304 instead of re-downloading
+_ROOT_JSON = orjson.dumps(
+    {
         "message": "Precision Marketing Intelligence Platform",
         "version": "1.0.0",
         "status": "running"
     }
+)
 
-@app.get("/health")
-async def health_check():
-    return {
+_HEALTH_JSON = orjson.dumps(
+    {
         "status": "healthy",
         "service": "Precision Marketing Intelligence Platform",
         "timestamp": "2025-08-27T10:00:00Z"
     }
+)
 
-@app.get("/api/features")
-async def get_features():
-    """Get platform features for the frontend"""
-    return {
+
+@lru_cache(maxsize=None)
+def _etag(payload: bytes) -> str:
+    return hashlib.md5(payload).hexdigest()
+
+
+def _static_json(request: Request, payload: bytes) -> Response:
+    """Serve a constant JSON payload with conditional-request support"""
+    etag = _etag(payload)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+    return Response(
+        content=payload,
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=60", "ETag": etag}
+    )
+
+
+@app.get("/")
+async def root(request: Request):
+    return _static_json(request, _ROOT_JSON)
+
+@app.get("/health")
+async def health_check(request: Request):
+    return _static_json(request, _HEALTH_JSON)
+
+# Static payload serialized once at import; the handler returns the
+# cached bytes instead of re-serializing a constant on every request
+_FEATURES_JSON = orjson.dumps(
+    {
         "features": [
             {
                 "id": "dashboard",
@@ -106,12 +153,24 @@ async def get_features():
             }
         ]
     }
+)
+
+
+@app.get("/api/features")
+async def get_features(request: Request):
+    """Get platform features for the frontend"""
+    return _static_json(request, _FEATURES_JSON)
 
 if __name__ == "__main__":
+    # reload and workers are mutually exclusive in uvicorn, so the dev
+    # reloader only runs in debug mode; otherwise scale across cores
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=settings.debug,
+        loop="uvloop",
+        http="httptools",
+        workers=1 if settings.debug else int(os.getenv("WEB_CONCURRENCY", os.cpu_count())),
         log_level="info"
     )
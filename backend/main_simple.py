@@ -1,12 +1,15 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+import orjson
 import uvicorn
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Precision Marketing Intelligence Platform",
     description="AI + BI platform that helps companies optimize marketing campaigns with predictive insights and interactive dashboards",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -18,26 +21,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-@app.get("/")
-async def root():
-    return {
+# Constant payloads serialized once at import; every hit serves the
+# cached bytes instead of rebuilding and re-encoding the same dicts
+_ROOT_JSON = orjson.dumps(
+    {
         "message": "Precision Marketing Intelligence Platform",
         "version": "1.0.0",
         "status": "running"
     }
+)
 
-@app.get("/health")
-async def health_check():
-    return {
+_HEALTH_JSON = orjson.dumps(
+    {
         "status": "healthy",
         "service": "Precision Marketing Intelligence Platform",
         "timestamp": "2025-08-27T10:00:00Z"
     }
+)
 
-@app.get("/api/features")
-async def get_features():
-    """Get platform features for the frontend"""
-    return {
+_FEATURES_JSON = orjson.dumps(
+    {
         "features": [
             {
                 "id": "dashboard",
@@ -69,13 +72,44 @@ async def get_features():
             }
         ]
     }
+)
+
+
+def _static_json(payload: bytes, max_age: int = 3600) -> Response:
+    return Response(
+        content=payload,
+        media_type="application/json",
+        headers={"Cache-Control": f"public, max-age={max_age}"}
+    )
+
+
+@app.get("/")
+async def root():
+    return _static_json(_ROOT_JSON)
+
+@app.get("/health")
+async def health_check():
+    return _static_json(_HEALTH_JSON, max_age=60)
+
+@app.get("/api/features")
+async def get_features():
+    """Get platform features for the frontend"""
+    return _static_json(_FEATURES_JSON, max_age=86400)
 
+# In production, serve with pre-forked workers instead of this block --
+# models load once before the fork with --preload and are shared
+# copy-on-write across workers:
+#
+#   gunicorn -k uvicorn.workers.UvicornWorker \
+#            --workers $((2 * $(nproc) + 1)) --preload main_simple:app
+#
 if __name__ == "__main__":
     print("🚀 Starting Precision Marketing Intelligence Platform...")
     uvicorn.run(
         "main_simple:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        loop="uvloop",
+        http="httptools",
         log_level="info"
     )
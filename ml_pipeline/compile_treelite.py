@@ -0,0 +1,53 @@
+"""
+Offline Treelite compilation of the tree-ensemble model pickles
+
+Produces a "<name>.so" sibling for each supported pickle;
+ml_service.load_models prefers the compiled library when
+treelite_runtime is installed. Run once after (re)training:
+
+    python compile_treelite.py [models_dir]
+
+Requires treelite (and a C toolchain); deliberately not part of the
+serving requirements. Non-tree models are skipped.
+"""
+
+import os
+import sys
+import logging
+
+import joblib
+import treelite
+
+from ml_service import MODEL_FILES
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def compile_model(models_dir: str, filename: str):
+    """Compile one tree-ensemble pickle to a shared object"""
+    pkl_path = os.path.join(models_dir, filename)
+    if not os.path.exists(pkl_path):
+        logger.info(f"Skipping {filename}: not found")
+        return
+
+    model = joblib.load(pkl_path)
+    try:
+        tl_model = treelite.sklearn.import_model(model)
+    except Exception as e:
+        logger.info(f"Skipping {filename}: not a supported tree model ({e})")
+        return
+
+    so_path = os.path.join(models_dir, filename.replace(".pkl", ".so"))
+    tl_model.export_lib(
+        toolchain='gcc',
+        libpath=so_path,
+        params={'parallel_comp': 8, 'quantize': 1}
+    )
+    logger.info(f"Compiled {filename} -> {os.path.basename(so_path)}")
+
+
+if __name__ == "__main__":
+    models_dir = sys.argv[1] if len(sys.argv) > 1 else "models/"
+    for model_filename in MODEL_FILES.values():
+        compile_model(models_dir, model_filename)
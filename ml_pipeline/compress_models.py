@@ -0,0 +1,58 @@
+"""
+One-shot recompression of the model pickles
+
+Large ensemble pickles are read in full at worker start; compressing
+them trades a few percent of CPU for several times less disk bandwidth
+on cold starts. joblib.load auto-detects the compression, so
+ml_service needs no changes. Run after (re)training:
+
+    python compress_models.py [models_dir]
+
+Prefers LZ4 (pip install lz4) and falls back to zlib. Note that
+compressed pickles cannot be mmap-shared across forked workers, so
+keep the models uncompressed if you rely on gunicorn --preload
+copy-on-write sharing instead.
+"""
+
+import os
+import pickle
+import sys
+import logging
+
+import joblib
+
+from ml_service import MODEL_FILES
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+try:
+    import lz4  # noqa: F401
+    COMPRESSION = ('lz4', 3)
+except ImportError:
+    COMPRESSION = ('zlib', 3)
+
+
+def compress_model(models_dir: str, filename: str):
+    """Re-dump one pickle with compression, in place"""
+    path = os.path.join(models_dir, filename)
+    if not os.path.exists(path):
+        logger.info(f"Skipping {filename}: not found")
+        return
+
+    original_size = os.path.getsize(path)
+    model = joblib.load(path)
+    joblib.dump(model, path, compress=COMPRESSION, protocol=pickle.HIGHEST_PROTOCOL)
+    compressed_size = os.path.getsize(path)
+    logger.info(
+        f"Compressed {filename} ({COMPRESSION[0]}): "
+        f"{original_size} -> {compressed_size} bytes"
+    )
+
+
+if __name__ == "__main__":
+    models_dir = sys.argv[1] if len(sys.argv) > 1 else "models/"
+    for model_filename in MODEL_FILES.values():
+        compress_model(models_dir, model_filename)
+    for extra in ("feature_encoder.pkl", "scaler.pkl"):
+        compress_model(models_dir, extra)
@@ -0,0 +1,58 @@
+"""
+Offline conversion of the pickled sklearn models to INT8 ONNX
+
+Produces a "<name>.int8.onnx" sibling for each model pickle in the
+models directory; ml_service.load_models prefers those variants when
+onnxruntime is installed. Run once after (re)training:
+
+    python quantize_models.py [models_dir]
+
+Requires skl2onnx and onnxruntime, which are deliberately not part of
+the serving requirements.
+"""
+
+import os
+import sys
+import logging
+
+import joblib
+from skl2onnx import convert_sklearn
+from skl2onnx.common.data_types import FloatTensorType
+from onnxruntime.quantization import quantize_dynamic, QuantType
+
+from ml_service import MODEL_FILES
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def quantize_model(models_dir: str, filename: str):
+    """Convert one pickle to ONNX and apply dynamic INT8 quantization"""
+    pkl_path = os.path.join(models_dir, filename)
+    if not os.path.exists(pkl_path):
+        logger.info(f"Skipping {filename}: not found")
+        return
+
+    model = joblib.load(pkl_path)
+    n_features = int(getattr(model, "n_features_in_", 0))
+    if not n_features:
+        logger.warning(f"Skipping {filename}: cannot determine input width")
+        return
+
+    onnx_model = convert_sklearn(
+        model,
+        initial_types=[("x", FloatTensorType([None, n_features]))]
+    )
+    fp32_path = os.path.join(models_dir, filename.replace(".pkl", ".onnx"))
+    with open(fp32_path, "wb") as f:
+        f.write(onnx_model.SerializeToString())
+
+    int8_path = os.path.join(models_dir, filename.replace(".pkl", ".int8.onnx"))
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    logger.info(f"Quantized {filename} -> {os.path.basename(int8_path)}")
+
+
+if __name__ == "__main__":
+    models_dir = sys.argv[1] if len(sys.argv) > 1 else "models/"
+    for model_filename in MODEL_FILES.values():
+        quantize_model(models_dir, model_filename)
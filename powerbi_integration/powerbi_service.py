@@ -1,21 +1,75 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import asyncio
+import functools
 import json
+import threading
+import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 import os
 from app.core.config import settings
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx clients
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+class PowerBIAuthError(Exception):
+    """Raised when a Power BI request cannot be authenticated"""
+
+
+def _loads(payload: bytes):
+    """Parse a response body, preferring orjson over stdlib json"""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _dumps(obj) -> bytes:
+    """Serialize a request body, preferring orjson over stdlib json"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
 class PowerBIService:
     """
     Power BI Service for integrating with Power BI REST API
     Handles authentication, report embedding, and data refresh
     """
     
+    # The anonymous embed-token request never varies; serialize it once
+    # so the common no-identity mint skips the dict build and encode
+    _ANON_TOKEN_BODY = _dumps({
+        "accessLevel": "View",
+        "allowSaveAs": False,
+        "identities": []
+    })
+    
     def __init__(self):
         self.client_id = settings.powerbi_client_id
         self.client_secret = settings.powerbi_client_secret
@@ -25,8 +79,51 @@ class PowerBIService:
         
         self.access_token = None
         self.token_expiry = None
+        # Monotonic deadlines: checked on every call path, so avoid
+        # building datetime objects per comparison (and wall-clock
+        # jumps can't invalidate or revive a token)
+        self._token_deadline = 0.0
+        self._refresh_at = 0.0
+        self._auth_lock = threading.Lock()
+        self._headers = {}
         self.base_url = "https://api.powerbi.com/v1.0/myorg"
+        # Most calls target the configured workspace; precompute its
+        # URL prefix instead of rebuilding it per request
+        self._ws_base = (
+            f"{self.base_url}/groups/{self.workspace_id}" if self.workspace_id else None
+        )
         
+        # Short-TTL cache for slowly-changing metadata endpoints, keyed
+        # by (endpoint, ids) so workspaces don't collide. Cleared on
+        # re-authentication and dataset refresh.
+        self._cache: Dict[tuple, tuple] = {}
+        
+        # ETag validators per URL for polled endpoints: unchanged
+        # responses come back as bodyless 304s and are served from the
+        # last parsed result
+        self._etags: Dict[str, str] = {}
+        self._etag_cache: Dict[str, List[Dict]] = {}
+
+        # Bound every call: connect fails fast, reads can't hang the
+        # caller forever on a stuck socket
+        self._timeout = (3.05, 30)
+        
+        # One keep-alive session for every call: all endpoints live on
+        # api.powerbi.com, so reusing pooled connections avoids paying
+        # the TCP+TLS handshake on each request. Transient 429/5xx
+        # responses retry with backoff at the connection-pool layer.
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(["GET", "POST"])
+            )
+        ))
+
         # Initialize authentication
         if self.client_id and self.client_secret and self.tenant_id:
             self.authenticate()
@@ -47,12 +144,27 @@ class PowerBIService:
                 "scope": "https://analysis.windows.net/powerbi/api/.default"
             }
             
-            response = requests.post(token_url, data=token_data)
+            response = self._session.post(token_url, data=token_data, timeout=self._timeout)
             response.raise_for_status()
             
-            token_info = response.json()
+            token_info = _loads(response.content)
             self.access_token = token_info["access_token"]
-            self.token_expiry = datetime.utcnow() + timedelta(seconds=token_info["expires_in"])
+            expires_in = token_info["expires_in"]
+            now = time.monotonic()
+            self._token_deadline = now + expires_in - 60
+            # Renew at ~90% of the token lifetime so refreshes happen
+            # before any request hits the expiry cliff
+            self._refresh_at = now + expires_in * 0.9
+            # Wall-clock expiry kept only for get_service_status display
+            self.token_expiry = datetime.utcnow() + timedelta(seconds=expires_in)
+            # Build the request headers once per token; every call path
+            # reuses this dict instead of reformatting the bearer string
+            self._headers = {
+                "Authorization": f"Bearer {self.access_token}",
+                "Content-Type": "application/json"
+            }
+            self._session.headers.update(self._headers)
+            self._cache.clear()
             
             logger.info("Power BI authentication successful")
             return True
@@ -63,31 +175,56 @@ class PowerBIService:
     
     def is_token_valid(self) -> bool:
         """Check if access token is still valid"""
-        if not self.access_token or not self.token_expiry:
-            return False
-        return datetime.utcnow() < self.token_expiry
+        return self.access_token is not None and time.monotonic() < self._token_deadline
     
-    def get_headers(self) -> Dict[str, str]:
-        """Get headers for API requests"""
-        if not self.is_token_valid():
-            self.authenticate()
+    def _token_stale(self) -> bool:
+        return self.access_token is None or time.monotonic() >= self._refresh_at
+    
+    def _prepare(self) -> Dict[str, str]:
+        """Return ready request headers, refreshing the token proactively
         
-        return {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+        Raises PowerBIAuthError when authentication cannot be
+        established; each method's exception handler turns that into
+        its usual empty/error return.
+        """
+        if self._token_stale():
+            # One caller refreshes; concurrent callers reuse its result
+            # instead of stampeding the token endpoint
+            with self._auth_lock:
+                if self._token_stale():
+                    self.authenticate()
+        if not self.is_token_valid():
+            raise PowerBIAuthError("Power BI authentication required")
+        return self._headers
+    
+    def _url_for(self, workspace: str, suffix: str) -> str:
+        """Build a workspace-scoped API URL"""
+        if self._ws_base is not None and workspace == self.workspace_id:
+            return self._ws_base + suffix
+        return f"{self.base_url}/groups/{workspace}{suffix}"
+    
+    def _cached(self, key: tuple, ttl: float, fn, *args):
+        """Serve a metadata fetch from cache while it is fresh"""
+        entry = self._cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        value = fn(*args)
+        # Empty results usually mean an upstream error; don't pin them
+        if value:
+            self._cache[key] = (time.monotonic(), value)
+        return value
     
     def get_workspaces(self) -> List[Dict]:
-        """Get list of available workspaces"""
+        """Get list of available workspaces (cached briefly)"""
+        return self._cached(("workspaces",), 300, self._fetch_workspaces)
+    
+    def _fetch_workspaces(self) -> List[Dict]:
         try:
-            if not self.is_token_valid():
-                return []
-            
             url = f"{self.base_url}/groups"
-            response = requests.get(url, headers=self.get_headers())
+            response = self._session.get(url, headers=self._prepare(), timeout=self._timeout)
             response.raise_for_status()
             
-            workspaces = response.json().get("value", [])
+            workspaces = _loads(response.content).get("value", [])
             logger.info(f"Retrieved {len(workspaces)} workspaces")
             return workspaces
             
@@ -96,21 +233,23 @@ class PowerBIService:
             return []
     
     def get_reports(self, workspace_id: Optional[str] = None) -> List[Dict]:
-        """Get list of reports in a workspace"""
+        """Get list of reports in a workspace (cached briefly)"""
+        return self._cached(
+            ("reports", workspace_id or self.workspace_id), 60,
+            self._fetch_reports, workspace_id)
+    
+    def _fetch_reports(self, workspace_id: Optional[str] = None) -> List[Dict]:
         try:
-            if not self.is_token_valid():
-                return []
-            
             workspace = workspace_id or self.workspace_id
             if not workspace:
                 logger.error("No workspace ID provided")
                 return []
             
-            url = f"{self.base_url}/groups/{workspace}/reports"
-            response = requests.get(url, headers=self.get_headers())
+            url = self._url_for(workspace, "/reports")
+            response = self._session.get(url, headers=self._prepare(), timeout=self._timeout)
             response.raise_for_status()
             
-            reports = response.json().get("value", [])
+            reports = _loads(response.content).get("value", [])
             logger.info(f"Retrieved {len(reports)} reports from workspace {workspace}")
             return reports
             
@@ -118,22 +257,44 @@ class PowerBIService:
             logger.error(f"Error getting reports: {e}")
             return []
     
-    def get_datasets(self, workspace_id: Optional[str] = None) -> List[Dict]:
-        """Get list of datasets in a workspace"""
+    def get_report(self, report_id: Optional[str] = None,
+                   workspace_id: Optional[str] = None) -> Dict:
+        """Get details for a single report"""
         try:
-            if not self.is_token_valid():
-                return []
+            report = report_id or self.report_id
+            workspace = workspace_id or self.workspace_id
+            if not report or not workspace:
+                logger.error("Report ID and workspace ID required")
+                return {}
+            
+            url = self._url_for(workspace, f"/reports/{report}")
+            response = self._session.get(url, headers=self._prepare(), timeout=self._timeout)
+            response.raise_for_status()
+            
+            return _loads(response.content)
             
+        except Exception as e:
+            logger.error(f"Error getting report {report_id}: {e}")
+            return {}
+    
+    def get_datasets(self, workspace_id: Optional[str] = None) -> List[Dict]:
+        """Get list of datasets in a workspace (cached briefly)"""
+        return self._cached(
+            ("datasets", workspace_id or self.workspace_id), 60,
+            self._fetch_datasets, workspace_id)
+    
+    def _fetch_datasets(self, workspace_id: Optional[str] = None) -> List[Dict]:
+        try:
             workspace = workspace_id or self.workspace_id
             if not workspace:
                 logger.error("No workspace ID provided")
                 return []
             
-            url = f"{self.base_url}/groups/{workspace}/datasets"
-            response = requests.get(url, headers=self.get_headers())
+            url = self._url_for(workspace, "/datasets")
+            response = self._session.get(url, headers=self._prepare(), timeout=self._timeout)
             response.raise_for_status()
             
-            datasets = response.json().get("value", [])
+            datasets = _loads(response.content).get("value", [])
             logger.info(f"Retrieved {len(datasets)} datasets from workspace {workspace}")
             return datasets
             
@@ -146,9 +307,6 @@ class PowerBIService:
                        user_email: Optional[str] = None) -> Dict:
         """Get embed token for a report"""
         try:
-            if not self.is_token_valid():
-                return {"error": "Authentication required"}
-            
             report = report_id or self.report_id
             workspace = workspace_id or self.workspace_id
             
@@ -156,26 +314,28 @@ class PowerBIService:
                 return {"error": "Report ID and workspace ID required"}
             
             # Generate embed token
-            token_url = f"{self.base_url}/groups/{workspace}/reports/{report}/GenerateToken"
-            
-            token_request = {
-                "accessLevel": "View",
-                "allowSaveAs": False,
-                "identities": []
-            }
+            token_url = self._url_for(workspace, f"/reports/{report}/GenerateToken")
             
-            # Add user identity if provided
+            # Add user identity if provided; the anonymous body is a
+            # constant, reused as precomputed bytes
             if user_email:
-                token_request["identities"].append({
-                    "username": user_email,
-                    "roles": ["Viewer"],
-                    "datasets": [workspace]
+                body = _dumps({
+                    "accessLevel": "View",
+                    "allowSaveAs": False,
+                    "identities": [{
+                        "username": user_email,
+                        "roles": ["Viewer"],
+                        "datasets": [workspace]
+                    }]
                 })
+            else:
+                body = self._ANON_TOKEN_BODY
             
-            response = requests.post(token_url, headers=self.get_headers(), json=token_request)
+            response = self._session.post(token_url, headers=self._prepare(),
+                                          data=body, timeout=self._timeout)
             response.raise_for_status()
             
-            token_info = response.json()
+            token_info = _loads(response.content)
             logger.info(f"Generated embed token for report {report}")
             
             return {
@@ -189,6 +349,23 @@ class PowerBIService:
             logger.error(f"Error generating embed token: {e}")
             return {"error": str(e)}
     
+    def get_embed_tokens_bulk(self, specs: List[tuple],
+                              max_workers: int = 10) -> List[Dict]:
+        """Mint embed tokens for many (report, workspace, user) specs at once
+        
+        Each token is an independent POST, so a bounded worker pool over
+        the shared session turns N serial round trips into roughly
+        N / max_workers. Results come back in spec order.
+        """
+        if not specs:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(specs))) as executor:
+            futures = [
+                executor.submit(self.get_embed_token, report, workspace, user)
+                for report, workspace, user in specs
+            ]
+            return [future.result() for future in futures]
+    
     def get_embed_url(self, report_id: Optional[str] = None,
                      workspace_id: Optional[str] = None) -> str:
         """Get embed URL for a report"""
@@ -204,19 +381,17 @@ class PowerBIService:
                        workspace_id: Optional[str] = None) -> bool:
         """Refresh a dataset"""
         try:
-            if not self.is_token_valid():
-                return False
-            
             workspace = workspace_id or self.workspace_id
             if not workspace:
                 logger.error("No workspace ID provided")
                 return False
             
-            url = f"{self.base_url}/groups/{workspace}/datasets/{dataset_id}/refreshes"
-            response = requests.post(url, headers=self.get_headers())
+            url = self._url_for(workspace, f"/datasets/{dataset_id}/refreshes")
+            response = self._session.post(url, headers=self._prepare(), timeout=self._timeout)
             response.raise_for_status()
             
             logger.info(f"Dataset {dataset_id} refresh initiated")
+            self._cache.clear()
             return True
             
         except Exception as e:
@@ -224,22 +399,37 @@ class PowerBIService:
             return False
     
     def get_dataset_refresh_history(self, dataset_id: str,
-                                  workspace_id: Optional[str] = None) -> List[Dict]:
-        """Get refresh history for a dataset"""
+                                  workspace_id: Optional[str] = None,
+                                  limit: Optional[int] = None) -> List[Dict]:
+        """Get refresh history for a dataset
+        
+        Pass limit to request only the newest N entries server-side
+        ($top) instead of downloading the full history.
+        """
         try:
-            if not self.is_token_valid():
-                return []
-            
             workspace = workspace_id or self.workspace_id
             if not workspace:
                 logger.error("No workspace ID provided")
                 return []
             
-            url = f"{self.base_url}/groups/{workspace}/datasets/{dataset_id}/refreshes"
-            response = requests.get(url, headers=self.get_headers())
+            url = self._url_for(workspace, f"/datasets/{dataset_id}/refreshes")
+            if limit:
+                url += f"?$top={int(limit)}"
+            
+            headers = self._prepare()
+            etag = self._etags.get(url)
+            if etag:
+                headers = {**headers, "If-None-Match": etag}
+            response = self._session.get(url, headers=headers, timeout=self._timeout)
+            if response.status_code == 304:
+                # Unchanged since last poll; reuse the parsed result
+                return self._etag_cache.get(url, [])
             response.raise_for_status()
             
-            refreshes = response.json().get("value", [])
+            refreshes = _loads(response.content).get("value", [])
+            if "ETag" in response.headers:
+                self._etags[url] = response.headers["ETag"]
+                self._etag_cache[url] = refreshes
             logger.info(f"Retrieved {len(refreshes)} refresh records for dataset {dataset_id}")
             return refreshes
             
@@ -247,13 +437,46 @@ class PowerBIService:
             logger.error(f"Error getting refresh history: {e}")
             return []
     
+    def iter_refresh_history(self, dataset_id: str,
+                             workspace_id: Optional[str] = None):
+        """Stream refresh records one at a time
+        
+        With ijson installed the response body is parsed incrementally
+        off the wire, so multi-MB histories never sit fully in memory;
+        otherwise falls back to iterating the parsed list.
+        """
+        workspace = workspace_id or self.workspace_id
+        if not workspace:
+            logger.error("No workspace ID provided")
+            return
+        
+        if ijson is None:
+            yield from self.get_dataset_refresh_history(dataset_id, workspace_id)
+            return
+        
+        url = self._url_for(workspace, f"/datasets/{dataset_id}/refreshes")
+        try:
+            with self._session.get(url, headers=self._prepare(), stream=True,
+                                   timeout=self._timeout) as response:
+                response.raise_for_status()
+                # The raw urllib3 stream is still gzip-compressed;
+                # decode it on read so ijson sees JSON bytes
+                response.raw.decode_content = True
+                yield from ijson.items(response.raw, "value.item")
+        except Exception as e:
+            logger.error(f"Error streaming refresh history: {e}")
+    
     def get_report_parameters(self, report_id: Optional[str] = None,
                              workspace_id: Optional[str] = None) -> List[Dict]:
-        """Get parameters for a report"""
+        """Get parameters for a report (cached briefly)"""
+        return self._cached(
+            ("parameters", report_id or self.report_id,
+             workspace_id or self.workspace_id), 300,
+            self._fetch_report_parameters, report_id, workspace_id)
+    
+    def _fetch_report_parameters(self, report_id: Optional[str] = None,
+                                 workspace_id: Optional[str] = None) -> List[Dict]:
         try:
-            if not self.is_token_valid():
-                return []
-            
             report = report_id or self.report_id
             workspace = workspace_id or self.workspace_id
             
@@ -261,11 +484,11 @@ class PowerBIService:
                 logger.error("Report ID and workspace ID required")
                 return []
             
-            url = f"{self.base_url}/groups/{workspace}/reports/{report}/parameters"
-            response = requests.get(url, headers=self.get_headers())
+            url = self._url_for(workspace, f"/reports/{report}/parameters")
+            response = self._session.get(url, headers=self._prepare(), timeout=self._timeout)
             response.raise_for_status()
             
-            parameters = response.json().get("value", [])
+            parameters = _loads(response.content).get("value", [])
             logger.info(f"Retrieved {len(parameters)} parameters for report {report}")
             return parameters
             
@@ -275,11 +498,15 @@ class PowerBIService:
     
     def get_report_pages(self, report_id: Optional[str] = None,
                          workspace_id: Optional[str] = None) -> List[Dict]:
-        """Get pages for a report"""
+        """Get pages for a report (cached briefly)"""
+        return self._cached(
+            ("pages", report_id or self.report_id,
+             workspace_id or self.workspace_id), 300,
+            self._fetch_report_pages, report_id, workspace_id)
+    
+    def _fetch_report_pages(self, report_id: Optional[str] = None,
+                            workspace_id: Optional[str] = None) -> List[Dict]:
         try:
-            if not self.is_token_valid():
-                return []
-            
             report = report_id or self.report_id
             workspace = workspace_id or self.workspace_id
             
@@ -287,11 +514,11 @@ class PowerBIService:
                 logger.error("Report ID and workspace ID required")
                 return []
             
-            url = f"{self.base_url}/groups/{workspace}/reports/{report}/pages"
-            response = requests.get(url, headers=self.get_headers())
+            url = self._url_for(workspace, f"/reports/{report}/pages")
+            response = self._session.get(url, headers=self._prepare(), timeout=self._timeout)
             response.raise_for_status()
             
-            pages = response.json().get("value", [])
+            pages = _loads(response.content).get("value", [])
             logger.info(f"Retrieved {len(pages)} pages for report {report}")
             return pages
             
@@ -304,18 +531,21 @@ class PowerBIService:
                            user_email: Optional[str] = None) -> Dict:
         """Create complete embed configuration for a report"""
         try:
-            # Get embed token
-            token_info = self.get_embed_token(report_id, workspace_id, user_email)
-            if "error" in token_info:
-                return token_info
+            # The token mint and the report lookup are independent
+            # network calls; overlapping them cuts the wall clock from
+            # the sum of the two round trips to the slower one
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                token_future = executor.submit(
+                    self.get_embed_token, report_id, workspace_id, user_email)
+                report_future = executor.submit(self.get_report, report_id, workspace_id)
+                token_info = token_future.result()
+                if "error" in token_info:
+                    return token_info
+                report_details = report_future.result()
             
             # Get embed URL
             embed_url = self.get_embed_url(report_id, workspace_id)
             
-            # Get report details
-            reports = self.get_reports(workspace_id)
-            report_details = next((r for r in reports if r["id"] == (report_id or self.report_id)), {})
-            
             config = {
                 "embed_url": embed_url,
                 "embed_token": token_info["embed_token"],
@@ -345,5 +575,167 @@ class PowerBIService:
             "status": "ready" if self.is_token_valid() else "not_authenticated"
         }
 
-# Create global instance
-powerbi_service = PowerBIService()
+class AsyncPowerBIService:
+    """
+    Async variant of PowerBIService built on httpx
+
+    A single AsyncClient carries every call, so independent metadata
+    fetches for one report fan out concurrently over keep-alive
+    connections (multiplexed on one socket when HTTP/2 is available)
+    instead of running serially.
+    """
+
+    def __init__(self):
+        if httpx is None:
+            raise RuntimeError("httpx is required for AsyncPowerBIService")
+
+        self.client_id = settings.powerbi_client_id
+        self.client_secret = settings.powerbi_client_secret
+        self.tenant_id = settings.powerbi_tenant_id
+        self.workspace_id = settings.powerbi_workspace_id
+        self.report_id = settings.powerbi_report_id
+
+        self.access_token = None
+        self.token_expiry = None
+        self.base_url = "https://api.powerbi.com/v1.0/myorg"
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=20),
+            timeout=30.0
+        )
+        self._auth_lock = asyncio.Lock()
+
+    async def authenticate(self) -> bool:
+        """Authenticate with Power BI using service principal"""
+        try:
+            if not all([self.client_id, self.client_secret, self.tenant_id]):
+                logger.warning("Power BI credentials not configured")
+                return False
+
+            token_url = f"https://login.microsoftonline.com/{self.tenant_id}/oauth2/v2.0/token"
+            token_data = {
+                "grant_type": "client_credentials",
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "scope": "https://analysis.windows.net/powerbi/api/.default"
+            }
+
+            response = await self._client.post(token_url, data=token_data)
+            response.raise_for_status()
+
+            token_info = _loads(response.content)
+            self.access_token = token_info["access_token"]
+            self.token_expiry = datetime.utcnow() + timedelta(seconds=token_info["expires_in"])
+            self._client.headers["Authorization"] = f"Bearer {self.access_token}"
+
+            logger.info("Power BI authentication successful")
+            return True
+
+        except Exception as e:
+            logger.error(f"Power BI authentication failed: {e}")
+            return False
+
+    def is_token_valid(self) -> bool:
+        """Check if access token is still valid"""
+        if not self.access_token or not self.token_expiry:
+            return False
+        return datetime.utcnow() < self.token_expiry
+
+    async def _ensure_token(self) -> bool:
+        """Authenticate on demand, serialized so callers don't stampede"""
+        if self.is_token_valid():
+            return True
+        async with self._auth_lock:
+            if not self.is_token_valid():
+                await self.authenticate()
+        return self.is_token_valid()
+
+    async def _get_value(self, path: str, label: str) -> List[Dict]:
+        """Fetch one list endpoint and unwrap its 'value' array"""
+        try:
+            if not await self._ensure_token():
+                return []
+            response = await self._client.get(path)
+            response.raise_for_status()
+            items = _loads(response.content).get("value", [])
+            logger.info(f"Retrieved {len(items)} {label}")
+            return items
+        except Exception as e:
+            logger.error(f"Error getting {label}: {e}")
+            return []
+
+    async def get_reports(self, workspace_id: Optional[str] = None) -> List[Dict]:
+        """Get list of reports in a workspace"""
+        workspace = workspace_id or self.workspace_id
+        if not workspace:
+            logger.error("No workspace ID provided")
+            return []
+        return await self._get_value(f"/groups/{workspace}/reports", "reports")
+
+    async def get_datasets(self, workspace_id: Optional[str] = None) -> List[Dict]:
+        """Get list of datasets in a workspace"""
+        workspace = workspace_id or self.workspace_id
+        if not workspace:
+            logger.error("No workspace ID provided")
+            return []
+        return await self._get_value(f"/groups/{workspace}/datasets", "datasets")
+
+    async def get_report_parameters(self, report_id: Optional[str] = None,
+                                    workspace_id: Optional[str] = None) -> List[Dict]:
+        """Get parameters for a report"""
+        report = report_id or self.report_id
+        workspace = workspace_id or self.workspace_id
+        if not report or not workspace:
+            logger.error("Report ID and workspace ID required")
+            return []
+        return await self._get_value(
+            f"/groups/{workspace}/reports/{report}/parameters", "parameters")
+
+    async def get_report_pages(self, report_id: Optional[str] = None,
+                               workspace_id: Optional[str] = None) -> List[Dict]:
+        """Get pages for a report"""
+        report = report_id or self.report_id
+        workspace = workspace_id or self.workspace_id
+        if not report or not workspace:
+            logger.error("Report ID and workspace ID required")
+            return []
+        return await self._get_value(
+            f"/groups/{workspace}/reports/{report}/pages", "pages")
+
+    async def describe_report(self, report_id: Optional[str] = None,
+                              workspace_id: Optional[str] = None) -> Dict:
+        """Fetch a report's pages, parameters and details concurrently"""
+        report = report_id or self.report_id
+        pages, parameters, reports = await asyncio.gather(
+            self.get_report_pages(report, workspace_id),
+            self.get_report_parameters(report, workspace_id),
+            self.get_reports(workspace_id)
+        )
+        details = next((r for r in reports if r["id"] == report), {})
+        return {
+            "report_id": report,
+            "details": details,
+            "pages": pages,
+            "parameters": parameters,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+    async def aclose(self):
+        """Close the underlying HTTP client"""
+        await self._client.aclose()
+
+
+@functools.lru_cache(maxsize=1)
+def get_powerbi_service() -> PowerBIService:
+    """Global Power BI service instance, built on first use"""
+    return PowerBIService()
+
+
+def __getattr__(name):
+    # PEP 562: `from powerbi_service import powerbi_service` keeps
+    # working, but importing the module no longer runs the OAuth
+    # round trip that PowerBIService() triggers
+    if name == 'powerbi_service':
+        return get_powerbi_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")